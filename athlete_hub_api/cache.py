@@ -0,0 +1,60 @@
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(key):
+    """
+    Return the current value of a version counter kept in the shared cache.
+
+    Counters start from the clock, so a counter that was evicted from the
+    cache never comes back with a value that was already handed out.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(*keys):
+    """Return the values of several version counters with one cache round trip."""
+    versions = cache.get_many(keys)
+    return [versions[key] if key in versions else get_version(key) for key in keys]
+
+
+def bump_version(key):
+    """
+    Increment a version counter once the current transaction commits.
+
+    Bumping before the commit would let another worker cache the old rows
+    under the new version.
+    """
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The counter was evicted, get_version restarts it from the clock
+            get_version(key)
+
+    transaction.on_commit(bump)
+
+
+def catalog_versioning(key):
+    """
+    Version, ETag and invalidation functions for a catalog versioned as a
+    whole under the counter key.
+
+    Returns (catalog_version, catalog_etag, invalidate_catalog), catalog_etag
+    is an etag_func for django.views.decorators.http.condition.
+    """
+    def catalog_version():
+        return get_version(key)
+
+    def catalog_etag(request, *args, **kwargs):
+        return f"catalog-{catalog_version()}"
+
+    def invalidate_catalog():
+        bump_version(key)
+
+    return catalog_version, catalog_etag, invalidate_catalog
@@ -0,0 +1,188 @@
+import bisect
+from functools import reduce
+from operator import or_
+from django.db import models, transaction
+from django.db.models import Q
+
+
+class ValueDistribution(models.Model):
+    """
+    Summary of a column over a set of rows, kept as the sorted distinct
+    values with cumulative counts.
+
+    The summarized columns have one or two decimal places, so the distinct
+    values stay few however many rows there are, and percentiles, quantiles
+    and histogram bins are answered by binary search.
+
+    Subclasses name the fields identifying a distribution in KEY_FIELDS and
+    supply their row source through value_counts, new_values and
+    stale_lookup.
+    """
+    KEY_FIELDS = ()
+
+    values = models.JSONField(default=list)
+    cumulative_counts = models.JSONField(default=list)
+    # Set when rows were changed or deleted, the summary is rebuilt on its next read
+    stale = models.BooleanField(default=True)
+
+    class Meta:
+        abstract = True
+
+    def value_counts(self):
+        """(value, count) pairs of the summarized rows, ordered by value."""
+        raise NotImplementedError
+
+    @classmethod
+    def new_values(cls, rows):
+        """Map the key of each distribution new source rows belong to, to the values they add."""
+        raise NotImplementedError
+
+    @classmethod
+    def stale_lookup(cls, row):
+        """Lookup of the distributions a changed or deleted source row belongs to."""
+        raise NotImplementedError
+
+    @property
+    def key(self):
+        return tuple(getattr(self, field) for field in self.KEY_FIELDS)
+
+    @property
+    def count(self):
+        return self.cumulative_counts[-1] if self.cumulative_counts else 0
+
+    def rebuild(self):
+        """Recompute the summary from the source rows."""
+        self.values = []
+        self.cumulative_counts = []
+        total = 0
+        for value, count in self.value_counts():
+            total += count
+            self.values.append(float(value))
+            self.cumulative_counts.append(total)
+        self.stale = False
+
+    def add(self, values):
+        """Merge new values into the summary."""
+        for value in values:
+            index = bisect.bisect_left(self.values, value)
+            if index == len(self.values) or self.values[index] != value:
+                self.values.insert(index, value)
+                self.cumulative_counts.insert(index, self.cumulative_counts[index - 1] if index else 0)
+            for i in range(index, len(self.cumulative_counts)):
+                self.cumulative_counts[i] += 1
+
+    def count_below(self, value):
+        index = bisect.bisect_left(self.values, value)
+        return self.cumulative_counts[index - 1] if index else 0
+
+    def count_at_or_below(self, value):
+        index = bisect.bisect_right(self.values, value)
+        return self.cumulative_counts[index - 1] if index else 0
+
+    def percentile(self, value):
+        """Percent of values below value, counting ties as half below."""
+        if not self.count:
+            return None
+        below = self.count_below(value)
+        equal = self.count_at_or_below(value) - below
+        return 100 * (below + equal / 2) / self.count
+
+    def value_at_rank(self, rank):
+        """The value at a zero based position in the sorted values."""
+        return self.values[bisect.bisect_right(self.cumulative_counts, rank)]
+
+    def quantile(self, q):
+        """Linearly interpolated quantile, q between 0 and 1."""
+        if not self.count:
+            return None
+        position = q * (self.count - 1)
+        lower = int(position)
+        upper = min(lower + 1, self.count - 1)
+        lower_value = self.value_at_rank(lower)
+        return lower_value + (self.value_at_rank(upper) - lower_value) * (position - lower)
+
+    def histogram(self, bins):
+        """Equal width bins between the lowest and highest value."""
+        if not self.count:
+            return {"edges": [], "counts": []}
+        low, high = self.values[0], self.values[-1]
+        width = (high - low) / bins
+        edges = [low + width * i for i in range(bins)] + [high]
+        counts = [self.count_below(edge) for edge in edges[1:-1]] + [self.count]
+        return {
+            "edges": edges,
+            "counts": [upper - lower for lower, upper in zip([0] + counts, counts)],
+        }
+
+    @classmethod
+    def key_lookup(cls, keys):
+        return reduce(or_, (Q(**dict(zip(cls.KEY_FIELDS, key))) for key in keys))
+
+    @classmethod
+    def lock(cls, keys):
+        """
+        Lock the distributions of keys, creating missing ones as stale.
+        Must be called inside a transaction.
+
+        Missing rows are inserted in key order and every row is then locked
+        in pk order, so writers and rebuilds never wait on each other in a
+        cycle. Stale rows are locked as well, so a rebuild can not read the
+        source rows before a writer holding the lock has committed.
+        """
+        keys = sorted(keys)
+        cls.objects.bulk_create([cls(**dict(zip(cls.KEY_FIELDS, key))) for key in keys], ignore_conflicts=True)
+        return list(cls.objects.select_for_update().filter(cls.key_lookup(keys)).order_by("pk"))
+
+    @classmethod
+    def record(cls, rows):
+        """
+        Merge new source rows into the distributions they belong to.
+
+        The distributions stay locked until the surrounding transaction
+        commits, so call it as the last step of the transaction that
+        inserted the rows. Stale distributions are only locked, they are
+        rebuilt from the source rows on their next read.
+        """
+        new_values = {key: values for key, values in cls.new_values(rows).items() if values}
+        if not new_values:
+            return
+
+        with transaction.atomic():
+            updated = []
+            for distribution in cls.lock(new_values):
+                if not distribution.stale:
+                    distribution.add(new_values[distribution.key])
+                    updated.append(distribution)
+            cls.objects.bulk_update(updated, ["values", "cumulative_counts"])
+
+    @classmethod
+    def row_saved(cls, row, created):
+        """
+        Keep distributions up to date after a source row is saved or deleted.
+
+        New rows are merged in. The old value of a changed or deleted row is
+        unknown, so its distributions are rebuilt instead.
+        """
+        if created:
+            cls.record([row])
+        else:
+            cls.objects.filter(**cls.stale_lookup(row)).update(stale=True)
+
+    @classmethod
+    def get_fresh(cls, keys):
+        """
+        The up to date distribution of each key, rebuilding missing or stale ones.
+
+        Fresh distributions are read without locking. Missing and stale
+        ones are locked while they are rebuilt.
+        """
+        distributions = {distribution.key: distribution for distribution in cls.objects.filter(cls.key_lookup(keys))}
+        outdated = [key for key in keys if key not in distributions or distributions[key].stale]
+        if outdated:
+            with transaction.atomic():
+                for distribution in cls.lock(outdated):
+                    if distribution.stale:
+                        distribution.rebuild()
+                        distribution.save()
+                    distributions[distribution.key] = distribution
+        return [distributions[key] for key in keys]
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     "rest_framework",
     'rest_framework_simplejwt',
+    "django_filters",
     "corsheaders",
     "users",
     "reports",
@@ -114,6 +115,33 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# Cached payloads are invalidated through version counters kept in the cache, so every
+# gunicorn worker has to share one cache for an edit made in one worker to reach the others.
+# Without `REDIS_URL` the Heroku app falls back to the database cache, whose table is created
+# in the release phase. The local memory default is only used in development and tests,
+# which run in a single process.
+if "REDIS_URL" in os.environ:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        },
+    }
+elif IS_HEROKU_APP:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        },
+    }
+
+# Seconds the trainer dashboard is cached for, 0 turns its cache off.
+TRAINER_DASHBOARD_CACHE_TIMEOUT = int(os.environ.get("TRAINER_DASHBOARD_CACHE_TIMEOUT", 30))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -9,10 +9,32 @@ from .models import (
     PitchArsenalPitchNote
 )
 
+
+# The __str__ of each model walks its report's user or its attribute's pitch,
+# so the change lists join them in instead of querying once per row
+class PitchAttributeAdmin(admin.ModelAdmin):
+    list_select_related = ("pitch",)
+
+class PitchAttributeChoiceAdmin(admin.ModelAdmin):
+    list_select_related = ("attribute__pitch",)
+
+class PitchArsenalReportAdmin(admin.ModelAdmin):
+    list_select_related = ("user",)
+
+class PitchAttributeScoreAdmin(admin.ModelAdmin):
+    list_select_related = ("report__user", "score__attribute__pitch")
+
+class PitchMetricsAdmin(admin.ModelAdmin):
+    list_select_related = ("report__user",)
+
+class PitchArsenalPitchNoteAdmin(admin.ModelAdmin):
+    list_select_related = ("report__user", "pitch")
+
+
 admin.site.register(Pitch)
-admin.site.register(PitchAttribute)
-admin.site.register(PitchAttributeChoice)
-admin.site.register(PitchArsenalReport)
-admin.site.register(PitchAttributeScore)
-admin.site.register(PitchMetrics)
-admin.site.register(PitchArsenalPitchNote)
+admin.site.register(PitchAttribute, PitchAttributeAdmin)
+admin.site.register(PitchAttributeChoice, PitchAttributeChoiceAdmin)
+admin.site.register(PitchArsenalReport, PitchArsenalReportAdmin)
+admin.site.register(PitchAttributeScore, PitchAttributeScoreAdmin)
+admin.site.register(PitchMetrics, PitchMetricsAdmin)
+admin.site.register(PitchArsenalPitchNote, PitchArsenalPitchNoteAdmin)
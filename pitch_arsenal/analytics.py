@@ -0,0 +1,98 @@
+from heapq import merge
+from pitch_report.models import PitchReport
+from .models import PitchMetrics
+
+METRICS = ("velocity", "spin", "horizontal_break", "vertical_break")
+METRICS_CHUNK_SIZE = 2000
+
+
+def lttb(xs, ys, threshold):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. The points between them are
+    split into threshold - 2 buckets, and from each bucket the point forming
+    the largest triangle with the previously kept point and the mean of the
+    next bucket is kept, so peaks and troughs survive.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        mean_x = sum(xs[end:next_end]) / (next_end - end)
+        mean_y = sum(ys[end:next_end]) / (next_end - end)
+
+        best, best_area = start, -1.0
+        for b in range(start, end):
+            area = abs((xs[a] - mean_x) * (ys[b] - ys[a]) - (xs[a] - xs[b]) * (mean_y - ys[a]))
+            if area > best_area:
+                best, best_area = b, area
+        kept.append(best)
+        a = best
+
+    kept.append(n - 1)
+    return kept
+
+
+def _metric_rows(user_id, pitch):
+    """
+    Yield (date, velocity, spin, horizontal break, vertical break) for every
+    pitch arsenal and pitch report of the athlete and pitch, oldest first.
+
+    Both tables are read in chunks through iterator() and merged on date.
+    Pitch reports have their own pitch table, so they are matched by pitch
+    name.
+    """
+    arsenal = PitchMetrics.objects.filter(
+        report__user_id=user_id,
+        pitch=pitch
+    ).values_list("report__date", *METRICS).order_by("report__date", "report_id")
+    reports = PitchReport.objects.filter(
+        user_id=user_id,
+        pitch__name=pitch.name
+    ).values_list("report__date", *METRICS).order_by("report__date", "report_id")
+
+    return merge(
+        arsenal.iterator(chunk_size=METRICS_CHUNK_SIZE),
+        reports.iterator(chunk_size=METRICS_CHUNK_SIZE),
+        key=lambda row: row[0]
+    )
+
+
+def pitch_metric_series(user_id, pitch, points=None):
+    """
+    Velocity, spin and break series of an athlete's pitch, in two queries.
+
+    With points, each series is downsampled to at most that many points
+    with lttb. Dates are the x axis, in days.
+    """
+    dates = []
+    values = {metric: [] for metric in METRICS}
+    for date, *row in _metric_rows(user_id, pitch):
+        dates.append(date)
+        for metric, value in zip(METRICS, row):
+            values[metric].append(value)
+
+    days = [date.toordinal() for date in dates]
+    series = {}
+    for metric in METRICS:
+        kept = lttb(days, [float(value) for value in values[metric]], points) if points else range(len(dates))
+        series[metric] = {
+            "dates": [dates[i] for i in kept],
+            "values": [values[metric][i] for i in kept],
+        }
+
+    return {
+        "id": pitch.pk,
+        "name": pitch.name,
+        "total": len(dates),
+        "series": series,
+    }
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PitchArsenalConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "pitch_arsenal"
+
+    def ready(self):
+        import pitch_arsenal.signals
@@ -0,0 +1,24 @@
+from athlete_hub_api.cache import catalog_versioning
+
+catalog_version, catalog_etag, invalidate_catalog = catalog_versioning("pitch-arsenal:catalog-version")
+
+# (catalog version, payload) of the catalog last built by this process
+_catalog_snapshot = (None, None)
+
+
+def get_catalog(build):
+    """
+    Return the pitch catalog, rebuilding this process's snapshot once the
+    catalog version has moved on.
+
+    The version is read before building, so a catalog read while an edit
+    commits is kept under the version that edit replaced and rebuilt on
+    the next request.
+    """
+    global _catalog_snapshot
+    version = catalog_version()
+    snapshot_version, data = _catalog_snapshot
+    if snapshot_version != version:
+        data = build()
+        _catalog_snapshot = (version, data)
+    return data
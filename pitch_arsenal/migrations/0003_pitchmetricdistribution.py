@@ -0,0 +1,28 @@
+# Generated by Django 4.2.5 on 2026-10-18 09:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pitch_arsenal", "0002_alter_pitcharsenalpitchnote_note"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PitchMetricDistribution",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("metric", models.CharField(choices=[("velocity", "Velocity"), ("spin", "Spin"), ("vertical_break", "Vertical break"), ("horizontal_break", "Horizontal break")], max_length=20)),
+                ("values", models.JSONField(default=list)),
+                ("cumulative_counts", models.JSONField(default=list)),
+                ("stale", models.BooleanField(default=True)),
+                ("pitch", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="metric_distributions", to="pitch_arsenal.pitch")),
+            ],
+            options={
+                "unique_together": {("pitch", "metric")},
+            },
+        ),
+    ]
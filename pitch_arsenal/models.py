@@ -1,6 +1,8 @@
+from collections import defaultdict
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.utils import timezone
+from athlete_hub_api.distributions import ValueDistribution
 
 
 class Pitch(models.Model):
@@ -66,4 +68,41 @@ class PitchArsenalPitchNote(models.Model):
     note = models.TextField(blank=True)
 
     def __str__(self):
-        return f"{self.pitch.name} note for {self.report.user.first_name + ' ' + self.report.user.last_name}'s report on {self.report.date}."
\ No newline at end of file
+        return f"{self.pitch.name} note for {self.report.user.first_name + ' ' + self.report.user.last_name}'s report on {self.report.date}."
+
+
+class PitchMetricDistribution(ValueDistribution):
+    """Summary of one metric over every PitchMetrics row of a pitch."""
+    METRIC_CHOICES = [
+        ("velocity", "Velocity"),
+        ("spin", "Spin"),
+        ("vertical_break", "Vertical break"),
+        ("horizontal_break", "Horizontal break"),
+    ]
+    KEY_FIELDS = ("pitch_id", "metric")
+
+    pitch = models.ForeignKey(Pitch, related_name="metric_distributions", on_delete=models.CASCADE)
+    metric = models.CharField(max_length=20, choices=METRIC_CHOICES)
+
+    class Meta:
+        unique_together = ("pitch", "metric")
+
+    def __str__(self):
+        return f"{self.pitch.name} {self.metric} distribution"
+
+    def value_counts(self):
+        return PitchMetrics.objects.filter(
+            pitch_id=self.pitch_id
+        ).values_list(self.metric).annotate(count=models.Count("id")).order_by(self.metric)
+
+    @classmethod
+    def new_values(cls, rows):
+        values = defaultdict(list)
+        for row in rows:
+            for metric, _ in cls.METRIC_CHOICES:
+                values[(row.pitch_id, metric)].append(float(getattr(row, metric)))
+        return values
+
+    @classmethod
+    def stale_lookup(cls, row):
+        return {"pitch_id": row.pitch_id}
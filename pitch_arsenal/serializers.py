@@ -37,8 +37,7 @@ class AttributeFormSerializer(serializers.ModelSerializer):
         fields = ("id", "attribute", "choices")
     
     def get_choices(self, obj):
-        choices = PitchAttributeChoice.objects.filter(attribute=obj)
-        return ChoiceFormSerializer(choices, many=True).data
+        return ChoiceFormSerializer(obj.pitchattributechoice_set.all(), many=True).data
 
 
 class PitchFormSerializer(serializers.ModelSerializer):
@@ -49,5 +48,4 @@ class PitchFormSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "attributes")
     
     def get_attributes(self, obj):
-        attributes = PitchAttribute.objects.filter(pitch=obj)
-        return AttributeFormSerializer(attributes, many=True).data
+        return AttributeFormSerializer(obj.pitchattribute_set.all(), many=True).data
@@ -0,0 +1,141 @@
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.db.models import Prefetch
+from .models import (
+    Pitch,
+    PitchArsenalReport,
+    PitchArsenalPitchNote,
+    PitchAttributeChoice,
+    PitchAttributeScore,
+    PitchMetricDistribution,
+    PitchMetrics,
+)
+
+DISTRIBUTION_METRICS = [metric for metric, _ in PitchMetricDistribution.METRIC_CHOICES]
+# Metrics are stored with one decimal place, extra places are rounded as the column would
+TENTHS = Decimal("0.1")
+
+
+def build_report_rows(report, report_data):
+    """
+    Build unsaved note, metric and attribute score rows for a submitted pitch arsenal report.
+
+    Pitches and choices are resolved with one query each, however many
+    pitches and attributes are submitted. The report does not need to be
+    saved yet, it only has to be saved before the rows are passed to
+    save_report_rows.
+
+    Raises Pitch.DoesNotExist, PitchAttributeChoice.DoesNotExist,
+    KeyError, ValueError or InvalidOperation for invalid submissions.
+    """
+    thrown = {int(pitch_id): pitch_data for pitch_id, pitch_data in report_data.items() if pitch_data["throws"]}
+    pitch_map = Pitch.objects.in_bulk(thrown.keys())
+    choice_map = PitchAttributeChoice.objects.in_bulk([
+        int(choice_id)
+        for pitch_data in thrown.values()
+        for choice_id in pitch_data["attributes"].values()
+    ])
+
+    notes, metrics, scores = [], [], []
+    for pitch_id, pitch_data in thrown.items():
+        pitch = pitch_map.get(pitch_id)
+        if pitch is None:
+            raise Pitch.DoesNotExist("Pitch does not exist")
+
+        notes.append(PitchArsenalPitchNote(report=report, pitch=pitch, note=pitch_data["notes"]))
+
+        pitch_metrics = pitch_data["metrics"]
+        row = PitchMetrics(
+            report=report,
+            pitch=pitch,
+            velocity=Decimal(pitch_metrics["velocity"]).quantize(TENTHS),
+            spin=int(pitch_metrics["spinRate"]),
+            horizontal_break=Decimal(pitch_metrics["horizontalBreak"]).quantize(TENTHS),
+            vertical_break=Decimal(pitch_metrics["verticalBreak"]).quantize(TENTHS)
+        )
+        # Out of range values would otherwise only fail on insert
+        for metric in DISTRIBUTION_METRICS:
+            try:
+                PitchMetrics._meta.get_field(metric).run_validators(getattr(row, metric))
+            except ValidationError:
+                raise ValueError(f"Invalid {metric} for {pitch.name}")
+        metrics.append(row)
+
+        for choice_id in pitch_data["attributes"].values():
+            choice = choice_map.get(int(choice_id))
+            if choice is None:
+                raise PitchAttributeChoice.DoesNotExist("Choice does not exist")
+            scores.append(PitchAttributeScore(report=report, score=choice))
+
+    return notes, metrics, scores
+
+
+def save_report_rows(notes, metrics, scores):
+    """Insert the rows built by build_report_rows with one statement per table."""
+    PitchArsenalPitchNote.objects.bulk_create(notes)
+    PitchMetrics.objects.bulk_create(metrics)
+    PitchAttributeScore.objects.bulk_create(scores)
+    # bulk_create sends no signals
+    PitchMetricDistribution.record(metrics)
+
+
+def get_report(pk, user):
+    """
+    A pitch arsenal report with its notes, metrics and attribute scores
+    loaded in four queries, or None. Athletes only get their own reports.
+    """
+    reports = PitchArsenalReport.objects.select_related("user").prefetch_related(
+        Prefetch("pitcharsenalpitchnote_set", queryset=PitchArsenalPitchNote.objects.select_related("pitch")),
+        Prefetch("pitchmetrics_set", queryset=PitchMetrics.objects.select_related("pitch")),
+        Prefetch(
+            "pitchattributescore_set",
+            queryset=PitchAttributeScore.objects.select_related("score__attribute__pitch").order_by("score__attribute_id")
+        ),
+    )
+    if not user.is_staff:
+        reports = reports.filter(user=user)
+    return reports.filter(pk=pk).first()
+
+
+def build_report_data(report):
+    """Build the payload of a pitch arsenal report, grouped by pitch in pitch order."""
+    pitches = {}
+
+    def pitch_entry(pitch):
+        return pitches.setdefault(pitch.pk, {
+            "id": pitch.pk,
+            "name": pitch.name,
+            "notes": "",
+            "metrics": None,
+            "attributes": [],
+        })
+
+    for note in report.pitcharsenalpitchnote_set.all():
+        pitch_entry(note.pitch)["notes"] = note.note
+    for metrics in report.pitchmetrics_set.all():
+        pitch_entry(metrics.pitch)["metrics"] = {
+            "velocity": metrics.velocity,
+            "spinRate": metrics.spin,
+            "horizontalBreak": metrics.horizontal_break,
+            "verticalBreak": metrics.vertical_break,
+        }
+    for score in report.pitchattributescore_set.all():
+        choice = score.score
+        pitch_entry(choice.attribute.pitch)["attributes"].append({
+            "id": choice.attribute_id,
+            "attribute": choice.attribute.attribute,
+            "choiceId": choice.pk,
+            "score": choice.score,
+            "description": choice.description,
+        })
+
+    return {
+        "id": report.pk,
+        "date": report.date,
+        "athlete": {
+            "id": report.user_id,
+            "first_name": report.user.first_name,
+            "last_name": report.user.last_name,
+        },
+        "pitches": [pitches[pitch_id] for pitch_id in sorted(pitches)],
+    }
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_catalog
+from .models import Pitch, PitchAttribute, PitchAttributeChoice, PitchMetricDistribution, PitchMetrics
+
+
+@receiver(post_save, sender=Pitch)
+@receiver(post_delete, sender=Pitch)
+@receiver(post_save, sender=PitchAttribute)
+@receiver(post_delete, sender=PitchAttribute)
+@receiver(post_save, sender=PitchAttributeChoice)
+@receiver(post_delete, sender=PitchAttributeChoice)
+def invalidate_pitch_catalog(sender, **kwargs):
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=PitchMetrics)
+@receiver(post_delete, sender=PitchMetrics)
+def update_metric_distribution(sender, instance, created=False, **kwargs):
+    PitchMetricDistribution.row_saved(instance, created)
@@ -1,3 +1,401 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from pitch_arsenal.analytics import lttb
+from pitch_arsenal.models import (
+    Pitch,
+    PitchArsenalPitchNote,
+    PitchArsenalReport,
+    PitchAttribute,
+    PitchAttributeChoice,
+    PitchAttributeScore,
+    PitchMetricDistribution,
+    PitchMetrics,
+)
+from pitch_report.models import FullPitchReport, PitchReport, Pitch as ReportPitch
+
+
+class AllPitchesViewTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.pitch = Pitch.objects.create(name="Fastball")
+        self.attribute = PitchAttribute.objects.create(pitch=self.pitch, attribute="Command")
+        PitchAttributeChoice.objects.create(attribute=self.attribute, score=1, description="Poor")
+
+    def test_matching_etag_returns_not_modified(self):
+        response = self.client.get(reverse("all-pitches"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("all-pitches"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_catalog_change_changes_etag(self):
+        etag = self.client.get(reverse("all-pitches"))["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            PitchAttributeChoice.objects.create(attribute=self.attribute, score=2, description="Good")
+        response = self.client.get(reverse("all-pitches"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data[0]["attributes"][0]["choices"]), 2)
+
+    def test_catalog_query_count_does_not_grow_with_pitches(self):
+        for name in ("Curveball", "Slider"):
+            pitch = Pitch.objects.create(name=name)
+            for attribute_name in ("Command", "Shape"):
+                attribute = PitchAttribute.objects.create(pitch=pitch, attribute=attribute_name)
+                PitchAttributeChoice.objects.create(attribute=attribute, score=1, description="Poor")
+                PitchAttributeChoice.objects.create(attribute=attribute, score=2, description="Good")
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("all-pitches"))
+        self.assertEqual(len(response.data), 3)
+        attribute = response.data[1]["attributes"][1]
+        self.assertEqual(attribute["attribute"], "Shape")
+        self.assertEqual([choice["score"] for choice in attribute["choices"]], [1, 2])
+
+    def test_catalog_is_served_from_the_snapshot_until_it_changes(self):
+        self.client.get(reverse("all-pitches"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("all-pitches"))
+        self.assertEqual(response.data[0]["name"], "Fastball")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Pitch.objects.create(name="Changeup")
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("all-pitches"))
+        self.assertEqual([pitch["name"] for pitch in response.data], ["Fastball", "Changeup"])
+
+
+class CreateReportViewTest(APITestCase):
+
+    def setUp(self):
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            first_name="Jane",
+            last_name="Doe"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.athlete)
+        self.pitches = []
+        for i in range(4):
+            pitch = Pitch.objects.create(name=f"Pitch {i}")
+            for j in range(3):
+                attribute = PitchAttribute.objects.create(pitch=pitch, attribute=f"Attribute {j}")
+                PitchAttributeChoice.objects.create(attribute=attribute, score=1, description="Poor")
+            self.pitches.append(pitch)
+
+    def pitch_payload(self, pitch, throws=True):
+        return {
+            "throws": throws,
+            "notes": f"{pitch.name} notes",
+            "metrics": {"velocity": "91.5", "spinRate": "2300", "horizontalBreak": "-4.2", "verticalBreak": "15.1"},
+            "attributes": {
+                str(choice.attribute_id): choice.pk
+                for choice in PitchAttributeChoice.objects.filter(attribute__pitch=pitch)
+            },
+        }
+
+    def payload(self, pitches):
+        return {"data": {
+            "athlete": {"id": self.athlete.pk},
+            "date": "2023-06-01",
+            "report": {str(pitch.pk): self.pitch_payload(pitch) for pitch in pitches},
+        }}
+
+    def test_creates_notes_metrics_and_scores(self):
+        data = self.payload(self.pitches)
+        data["data"]["report"][str(self.pitches[3].pk)]["throws"] = False
+        response = self.client.post(reverse("create-report"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        report = PitchArsenalReport.objects.get(user=self.athlete)
+        self.assertEqual(PitchArsenalPitchNote.objects.filter(report=report).count(), 3)
+        self.assertEqual(PitchAttributeScore.objects.filter(report=report).count(), 9)
+        metrics = PitchMetrics.objects.get(report=report, pitch=self.pitches[0])
+        self.assertEqual(metrics.velocity, Decimal("91.5"))
+        self.assertEqual(metrics.spin, 2300)
+        self.assertEqual(metrics.horizontal_break, Decimal("-4.2"))
+
+    def test_query_count_does_not_grow_with_pitches(self):
+        payloads = [self.payload(self.pitches[:1]), self.payload(self.pitches)]
+        for data in payloads:
+            with self.assertNumQueries(13):
+                self.client.post(reverse("create-report"), data, format="json")
+
+    def test_unknown_choice_creates_nothing(self):
+        data = self.payload(self.pitches)
+        data["data"]["report"][str(self.pitches[2].pk)]["attributes"]["0"] = 0
+        response = self.client.post(reverse("create-report"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Choice does not exist"})
+        self.assertFalse(PitchArsenalReport.objects.exists())
+        self.assertFalse(PitchArsenalPitchNote.objects.exists())
+
+    def test_invalid_metrics_create_nothing(self):
+        data = self.payload(self.pitches)
+        data["data"]["report"][str(self.pitches[1].pk)]["metrics"]["velocity"] = "fast"
+        response = self.client.post(reverse("create-report"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PitchArsenalReport.objects.exists())
+        self.assertFalse(PitchMetrics.objects.exists())
+
+    def test_out_of_range_metrics_create_nothing(self):
+        for metric, value in (("velocity", "1000"), ("verticalBreak", "-1000"), ("horizontalBreak", "NaN")):
+            data = self.payload(self.pitches)
+            data["data"]["report"][str(self.pitches[1].pk)]["metrics"][metric] = value
+            response = self.client.post(reverse("create-report"), data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PitchArsenalReport.objects.exists())
+        self.assertFalse(PitchMetrics.objects.exists())
+
+
+class ReportViewTest(APITestCase):
+
+    def setUp(self):
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            first_name="Jane",
+            last_name="Doe"
+        )
+        self.other = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            first_name="John",
+            last_name="Doe"
+        )
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            first_name="Trainer",
+            last_name="Doe",
+            is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.athlete)
+
+    def create_report(self, num_pitches, num_attributes):
+        report = PitchArsenalReport.objects.create(user=self.athlete, date="2023-06-01")
+        for i in range(num_pitches):
+            pitch, _ = Pitch.objects.get_or_create(name=f"Pitch {i}")
+            PitchArsenalPitchNote.objects.create(report=report, pitch=pitch, note=f"Note {i}")
+            PitchMetrics.objects.create(
+                report=report,
+                pitch=pitch,
+                velocity=Decimal("90.1"),
+                spin=2200 + i,
+                horizontal_break=Decimal("3.5"),
+                vertical_break=Decimal("-1.5")
+            )
+            for j in range(num_attributes):
+                attribute = PitchAttribute.objects.create(pitch=pitch, attribute=f"Attribute {j}")
+                choice = PitchAttributeChoice.objects.create(attribute=attribute, score=j, description=f"Level {j}")
+                PitchAttributeScore.objects.create(report=report, score=choice)
+        return report
+
+    def test_report_is_grouped_by_pitch(self):
+        report = self.create_report(2, 2)
+        response = self.client.get(reverse("pitch-arsenal-report", args=[report.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["athlete"]["id"], self.athlete.pk)
+
+        pitch = response.data["pitches"][1]
+        self.assertEqual(pitch["name"], "Pitch 1")
+        self.assertEqual(pitch["notes"], "Note 1")
+        self.assertEqual(pitch["metrics"]["spinRate"], 2201)
+        self.assertEqual(pitch["metrics"]["velocity"], Decimal("90.1"))
+        self.assertEqual(
+            [(attribute["attribute"], attribute["score"], attribute["description"]) for attribute in pitch["attributes"]],
+            [("Attribute 0", 0, "Level 0"), ("Attribute 1", 1, "Level 1")]
+        )
+
+    def test_query_count_does_not_grow_with_pitches(self):
+        small = self.create_report(1, 1)
+        large = self.create_report(10, 6)
+        for report in (small, large):
+            with self.assertNumQueries(4):
+                response = self.client.get(reverse("pitch-arsenal-report", args=[report.pk]))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sum(len(pitch["attributes"]) for pitch in response.data["pitches"]), 60)
+
+    def test_other_athletes_can_not_read_the_report(self):
+        report = self.create_report(1, 1)
+        self.client.force_authenticate(user=self.other)
+        response = self.client.get(reverse("pitch-arsenal-report", args=[report.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=self.trainer)
+        response = self.client.get(reverse("pitch-arsenal-report", args=[report.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class LttbTest(SimpleTestCase):
+
+    def test_keeps_endpoints_and_peaks(self):
+        xs = list(range(100))
+        ys = [0.0] * 100
+        ys[37] = 50.0
+        ys[81] = -20.0
+        kept = lttb(xs, ys, 10)
+        self.assertEqual(len(kept), 10)
+        self.assertEqual(kept[0], 0)
+        self.assertEqual(kept[-1], 99)
+        self.assertIn(37, kept)
+        self.assertIn(81, kept)
+        self.assertEqual(kept, sorted(kept))
+
+    def test_short_series_are_kept_whole(self):
+        self.assertEqual(lttb([1, 2, 3], [1.0, 2.0, 3.0], 10), [0, 1, 2])
+
+
+class PitchMetricTrendTest(APITestCase):
+
+    def setUp(self):
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            first_name="Jane",
+            last_name="Doe"
+        )
+        self.other = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            first_name="John",
+            last_name="Doe"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.athlete)
+        self.pitch = Pitch.objects.create(name="Fastball")
+        report_pitch = ReportPitch.objects.create(name="Fastball")
+
+        start = datetime.date(2023, 1, 1)
+        for i in range(30):
+            date = start + datetime.timedelta(days=2 * i)
+            velocity = Decimal("99.0") if i == 13 else Decimal("90.0")
+            report = PitchArsenalReport.objects.create(user=self.athlete, date=date)
+            PitchMetrics.objects.create(
+                report=report,
+                pitch=self.pitch,
+                velocity=velocity,
+                spin=2200,
+                horizontal_break=Decimal("3.0"),
+                vertical_break=Decimal("12.0")
+            )
+            full_report = FullPitchReport.objects.create(user=self.athlete, date=date + datetime.timedelta(days=1))
+            PitchReport.objects.create(
+                user=self.athlete,
+                report=full_report,
+                pitch=report_pitch,
+                velocity=Decimal("91.0"),
+                spin=2250,
+                horizontal_break=Decimal("3.5"),
+                vertical_break=Decimal("11.5")
+            )
+        self.url = reverse("pitch-metric-trend", args=[self.athlete.pk, self.pitch.pk])
+
+    def test_merges_both_report_types_by_date(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 60)
+
+        velocity = response.data["series"]["velocity"]
+        self.assertEqual(velocity["dates"], sorted(velocity["dates"]))
+        self.assertEqual(velocity["values"][:2], [Decimal("90.0"), Decimal("91.0")])
+        self.assertEqual(response.data["series"]["spin"]["values"][:2], [2200, 2250])
+
+    def test_downsamples_without_losing_peaks(self):
+        response = self.client.get(self.url, {"points": 12})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        velocity = response.data["series"]["velocity"]
+        self.assertEqual(len(velocity["values"]), 12)
+        self.assertIn(Decimal("99.0"), velocity["values"])
+        self.assertEqual(velocity["dates"][0], datetime.date(2023, 1, 1))
+
+    def test_invalid_point_budget(self):
+        response = self.client.get(self.url, {"points": 2})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {"points": "many"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_athletes_can_only_read_their_own_series(self):
+        self.client.force_authenticate(user=self.other)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PitchMetricPercentileTest(APITestCase):
+
+    def setUp(self):
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            first_name="Jane",
+            last_name="Doe"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.athlete)
+        self.pitch = Pitch.objects.create(name="Fastball")
+        for velocity, spin in [("88.0", 2100), ("90.0", 2200), ("92.4", 2350), ("94.0", 2400), ("95.0", 2500)]:
+            self.add_metrics(velocity, spin)
+        self.url = reverse("pitch-metric-percentile", args=[self.pitch.pk])
+
+    def add_metrics(self, velocity, spin):
+        report = PitchArsenalReport.objects.create(user=self.athlete, date="2023-06-01")
+        return PitchMetrics.objects.create(
+            report=report,
+            pitch=self.pitch,
+            velocity=Decimal(velocity),
+            spin=spin,
+            horizontal_break=Decimal("3.0"),
+            vertical_break=Decimal("12.0")
+        )
+
+    def test_ranks_a_metric_vector(self):
+        response = self.client.get(self.url, {"velocity": "92.4", "spin": "2300"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(response.data["percentiles"], {"velocity": 50, "spin": 40})
+
+    def test_new_reports_are_merged_without_rebuilding(self):
+        self.client.get(self.url, {"velocity": "92.4"})
+        self.add_metrics("99.0", 2600)
+
+        distribution = PitchMetricDistribution.objects.get(pitch=self.pitch, metric="velocity")
+        self.assertFalse(distribution.stale)
+        self.assertEqual(distribution.count, 6)
+        # Fresh distributions are read without locking them
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"velocity": "99.0"})
+        self.assertAlmostEqual(response.data["percentiles"]["velocity"], 100 * 5.5 / 6)
+
+    def test_changed_metrics_mark_the_distributions_stale(self):
+        self.client.get(self.url, {"velocity": "92.4"})
+        metrics = PitchMetrics.objects.get(velocity=Decimal("95.0"))
+        metrics.velocity = Decimal("85.0")
+        metrics.save()
+        self.assertTrue(PitchMetricDistribution.objects.get(pitch=self.pitch, metric="velocity").stale)
+
+        response = self.client.get(self.url, {"velocity": "86.0"})
+        self.assertEqual(response.data["percentiles"]["velocity"], 20)
+
+    def test_invalid_metrics(self):
+        response = self.client.get(self.url, {"velocity": "fast"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_finite_metrics(self):
+        for value in ("nan", "inf"):
+            response = self.client.get(self.url, {"velocity": value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data, {"error": "velocity must be a number"})
@@ -1,7 +1,16 @@
 from django.urls import path
-from .views import AllPitchesView, CreateReportView
+from .views import (
+    AllPitchesView,
+    CreateReportView,
+    PitchMetricPercentile,
+    PitchMetricTrend,
+    ReportView,
+)
 
 urlpatterns = [
     path('all-pitches/', AllPitchesView.as_view(), name='all-pitches'),
-    path("create-report/", CreateReportView.as_view(), name="create-report")
+    path("create-report/", CreateReportView.as_view(), name="create-report"),
+    path("report/<int:pk>/", ReportView.as_view(), name="pitch-arsenal-report"),
+    path("metric-trend/<int:user_pk>/<int:pitch_pk>/", PitchMetricTrend.as_view(), name="pitch-metric-trend"),
+    path("metric-percentile/<int:pitch_pk>/", PitchMetricPercentile.as_view(), name="pitch-metric-percentile"),
 ]
\ No newline at end of file
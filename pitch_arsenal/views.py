@@ -1,26 +1,37 @@
 import datetime
-from decimal import Decimal, InvalidOperation
+import math
+from decimal import InvalidOperation
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .models import (
-    Pitch,
-    PitchArsenalReport,
-    PitchMetrics,
-    PitchAttribute,
-    PitchAttributeChoice,
-    PitchAttributeScore,
-    PitchArsenalPitchNote
-)
+from .analytics import pitch_metric_series
+from .cache import catalog_etag, get_catalog
+from .models import Pitch, PitchArsenalReport, PitchAttributeChoice, PitchMetricDistribution
 from .serializers import PitchFormSerializer
+from .services import (
+    DISTRIBUTION_METRICS,
+    build_report_data,
+    build_report_rows,
+    get_report,
+    save_report_rows,
+)
+
+
+def build_catalog():
+    """Serialize every pitch with its attributes and their choices, in three queries."""
+    pitches = Pitch.objects.prefetch_related("pitchattribute_set__pitchattributechoice_set")
+    return PitchFormSerializer(pitches, many=True).data
+
 
 class AllPitchesView(APIView):
+    @method_decorator(condition(etag_func=catalog_etag))
     def get(self, request):
-        pitches = Pitch.objects.all()
-        serializer = PitchFormSerializer(pitches, many=True)
-        return Response(serializer.data)
+        return Response(get_catalog(build_catalog))
 
 
 class CreateReportView(APIView):
@@ -44,52 +55,106 @@ class CreateReportView(APIView):
         except ValueError:
             return Response({"error": "Invalid date format. Excpected YYYY-MM_DD."}, status=status.HTTP_400_BAD_REQUEST)
         
-        report = PitchArsenalReport.objects.create(
-            user=athlete,
-            date=date_obj
-        )
-
-        for pitchId, pitchData in data["report"].items():
-            if pitchData["throws"]:
-                pitch = Pitch.objects.get(pk=pitchId)
-
-                PitchArsenalPitchNote.objects.create(
-                    report=report,
-                    pitch=pitch,
-                    note=pitchData["notes"]
-                )
-
-                velocity= Decimal(pitchData["metrics"]["velocity"])
-                spin_rate = int(pitchData["metrics"]["spinRate"])
-                horizontal_break = Decimal(pitchData["metrics"]["horizontalBreak"])
-                vertical_break = Decimal(pitchData["metrics"]["verticalBreak"])
-
-                PitchMetrics.objects.create(
-                    report=report,
-                    pitch=pitch,
-                    velocity=velocity,
-                    spin=spin_rate,
-                    horizontal_break=horizontal_break,
-                    vertical_break=vertical_break
-                )
-
-                for id, score in pitchData["attributes"].items():
-                    choice_obj = PitchAttributeChoice.objects.get(pk=score)
-
-                    attr_score = PitchAttributeScore.objects.create(
-                        report=report,
-                        score=choice_obj
-                    )
-                
+        try:
+            report = PitchArsenalReport(user=athlete, date=date_obj)
+            notes, metrics, scores = build_report_rows(report, data["report"])
+        except Pitch.DoesNotExist:
+            return Response({"error": "Pitch does not exist"}, status=status.HTTP_400_BAD_REQUEST)
+        except PitchAttributeChoice.DoesNotExist:
+            return Response({"error": "Choice does not exist"}, status=status.HTTP_400_BAD_REQUEST)
+        except KeyError as e:
+            return Response({"error": f"{e.args[0]} not provided"}, status=status.HTTP_400_BAD_REQUEST)
+        except (ValueError, InvalidOperation):
+            return Response({"error": "Invalid pitch report values"}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            report.save()
+            save_report_rows(notes, metrics, scores)
+
         return Response({"Report created"}, status=status.HTTP_201_CREATED)
 
 
+class ReportView(APIView):
+    """
+    A pitch arsenal report grouped by pitch. Athletes can read their own
+    reports, staff can read any.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        report = get_report(pk, request.user)
+        if report is None:
+            return Response({"error": "Report does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(build_report_data(report), status=status.HTTP_200_OK)
 
 
+class PitchMetricTrend(APIView):
+    """
+    Velocity, spin and break series of an athlete's pitch across pitch
+    arsenal reports and pitch reports. ?points=N downsamples each series
+    to at most N points.
+    """
+    permission_classes = [IsAuthenticated]
 
-                
+    def get(self, request, user_pk, pitch_pk):
+        if not request.user.is_staff and request.user.pk != user_pk:
+            return Response({"error": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
 
+        points = request.query_params.get("points")
+        if points is not None:
+            try:
+                points = int(points)
+            except ValueError:
+                return Response({"error": "points must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+            if points < 3:
+                return Response({"error": "points must be at least 3"}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            pitch = Pitch.objects.get(pk=pitch_pk)
+        except Pitch.DoesNotExist:
+            return Response({"error": "Pitch does not exist"}, status=status.HTTP_404_NOT_FOUND)
 
+        return Response(pitch_metric_series(user_pk, pitch, points), status=status.HTTP_200_OK)
 
 
+class PitchMetricPercentile(APIView):
+    """
+    Percentiles of a metric vector among every report of a pitch, for example
+    ?velocity=92.4&spin=2350. Any of velocity, spin, vertical_break and
+    horizontal_break can be given.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pitch_pk):
+        try:
+            pitch = Pitch.objects.get(pk=pitch_pk)
+        except Pitch.DoesNotExist:
+            return Response({"error": "Pitch does not exist"}, status=status.HTTP_404_NOT_FOUND)
+
+        values = {}
+        for metric in DISTRIBUTION_METRICS:
+            if metric not in request.query_params:
+                continue
+            try:
+                values[metric] = float(request.query_params[metric])
+            except ValueError:
+                return Response({"error": f"{metric} must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+            # float() accepts nan and inf, which can not be rendered as JSON
+            if not math.isfinite(values[metric]):
+                return Response({"error": f"{metric} must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        if not values:
+            return Response({"error": "No metrics provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        distributions = dict(zip(
+            values,
+            PitchMetricDistribution.get_fresh([(pitch.pk, metric) for metric in values])
+        ))
+        data = {
+            "pitch": pitch.pk,
+            "count": distributions[next(iter(values))].count,
+            "percentiles": {
+                metric: distributions[metric].percentile(value)
+                for metric, value in values.items()
+            },
+        }
+        return Response(data, status=status.HTTP_200_OK)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PitchReportConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "pitch_report"
+
+    def ready(self):
+        import pitch_report.signals
@@ -0,0 +1,3 @@
+from athlete_hub_api.cache import catalog_versioning
+
+catalog_version, catalog_etag, invalidate_catalog = catalog_versioning("pitch-report:catalog-version")
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_catalog
+from .models import Pitch
+
+
+@receiver(post_save, sender=Pitch)
+@receiver(post_delete, sender=Pitch)
+def invalidate_pitch_catalog(sender, **kwargs):
+    invalidate_catalog()
@@ -1,3 +1,30 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
 
-# Create your tests here.
+from pitch_report.models import Pitch
+
+
+class PitchListTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Pitch.objects.create(name="Fastball")
+
+    def test_matching_etag_returns_not_modified(self):
+        response = self.client.get(reverse("get-pitches"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("get-pitches"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_pitch_changes_etag(self):
+        etag = self.client.get(reverse("get-pitches"))["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Pitch.objects.create(name="Slider")
+        response = self.client.get(reverse("get-pitches"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
@@ -1,9 +1,12 @@
 import json
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from .cache import catalog_etag
 from .serializers import (
     PitchSerializer
 )
@@ -13,6 +16,7 @@ from .models import (
 
 
 class PitchList(APIView):
+    @method_decorator(condition(etag_func=catalog_etag))
     def get(self, request):
         pitches = Pitch.objects.all()
         serializer = PitchSerializer(pitches, many=True)
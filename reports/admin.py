@@ -6,8 +6,6 @@ from .models import (
     Report,
     QualitativeAssessment,
     QuantitativeAssessment,
-    QualitativeAssessmentScore,
-    QuantitativeAssessmentScore,
     QualitativeAssessmentChoices,
     Drill,
 )
@@ -54,8 +52,7 @@ class ReportTemplateAdmin(admin.ModelAdmin):
 admin.site.register(ReportTemplate, ReportTemplateAdmin)
 # admin.site.register(Report)
 admin.site.register(QuantitativeAssessment, CustomQuantitativeAssessmentAdmin)
-# admin.site.register(QuantitativeAssessmentScore)
+# admin.site.register(AssessmentScore)
 # admin.site.register(QualitativeAssessment)
 # admin.site.register(QualitativeAssessmentChoices, QualitativeAssessmentChoiceAdmin)
-# admin.site.register(QualitativeAssessmentScore)
 admin.site.register(Drill)
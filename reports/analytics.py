@@ -0,0 +1,231 @@
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from .models import AssessmentScore, Report
+
+
+def deltas(values):
+    """Change from the previous value, None for the first one."""
+    return [None] + [current - previous for previous, current in zip(values, values[1:])]
+
+
+def rolling_mean(values, window):
+    """Trailing mean over up to window values, computed with a running sum."""
+    means = []
+    total = Decimal(0)
+    for i, value in enumerate(values):
+        total += value
+        if i >= window:
+            total -= values[i - window]
+        means.append(total / min(i + 1, window))
+    return means
+
+
+def slope(xs, ys):
+    """Least squares slope of ys over xs, None when it is undefined."""
+    n = len(xs)
+    if n < 2:
+        return None
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return None
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return covariance / variance
+
+
+def _score(row):
+    """The value of a quantitative score row or the choice name of a qualitative one."""
+    return row["value"] if row["choice_id"] is None else row["choice__choice"]
+
+
+def _series(rows):
+    """Group score rows ordered by assessment and date into one series per assessment."""
+    series = {}
+    for row in rows:
+        entry = series.setdefault(row["assessment_id"], {
+            "id": row["assessment_id"],
+            "name": row["assessment__name"],
+            "type": row["assessment__assessment_type"],
+            "unit": row["assessment__unit"],
+            "dates": [],
+            "scores": [],
+            "passed": [],
+            "did_not_test": [],
+        })
+        entry["dates"].append(row["report__creation_date"])
+        entry["scores"].append(_score(row))
+        entry["passed"].append(row["is_passing"])
+        entry["did_not_test"].append(row["did_not_test"])
+    return series
+
+
+def _add_trend(entry, window):
+    """
+    Add deltas, a rolling mean and a slope in units per day to a quantitative series.
+
+    Scores of assessments the athlete did not test are left out of the numbers.
+    """
+    tested = [i for i, skipped in enumerate(entry["did_not_test"]) if not skipped]
+    values = [entry["scores"][i] for i in tested]
+    first_date = entry["dates"][0]
+    days = [Decimal((entry["dates"][i] - first_date).days) for i in tested]
+
+    entry["deltas"] = [None] * len(entry["scores"])
+    entry["rolling_mean"] = [None] * len(entry["scores"])
+    for i, delta, mean in zip(tested, deltas(values), rolling_mean(values, window)):
+        entry["deltas"][i] = delta
+        entry["rolling_mean"][i] = mean
+    entry["slope"] = slope(days, values)
+
+
+def assessment_trends(user_id, template_id, window=3):
+    """
+    Score time series for every assessment an athlete was scored on in a template.
+
+    The score table is read once, ordered so the series can be built in a
+    single pass.
+    """
+    scores = AssessmentScore.objects.filter(
+        user_id=user_id,
+        report__template_id=template_id
+    ).values(
+        "assessment_id",
+        "assessment__name",
+        "assessment__assessment_type",
+        "assessment__unit",
+        "report__creation_date",
+        "value",
+        "choice_id",
+        "choice__choice",
+        "is_passing",
+        "did_not_test",
+    ).order_by("assessment_id", "report__creation_date", "report_id")
+
+    series = _series(scores)
+    for entry in series.values():
+        if entry["type"] == "quantitative":
+            _add_trend(entry, window)
+    return [series[pk] for pk in sorted(series)]
+
+
+def _transition(old, new):
+    if old is None or new is None or old["did_not_test"] or new["did_not_test"]:
+        return None
+    if old["passed"] == new["passed"]:
+        return "unchanged"
+    return "improved" if new["passed"] else "regressed"
+
+
+def compare_reports(user_id, template_id, old_date, new_date):
+    """
+    Per-assessment comparison of the reports an athlete got from a template
+    on two dates, or None when either report does not exist.
+
+    Both reports are found in one query and their scores are read in one
+    more, so the cost does not depend on the size of the reports.
+    """
+    # Like get_report, the first report of a date is the one shown
+    report_ids = {}
+    for creation_date, pk in Report.objects.filter(
+        user_id=user_id,
+        template_id=template_id,
+        creation_date__in=[old_date, new_date]
+    ).values_list("creation_date", "pk").order_by("-pk"):
+        report_ids[creation_date] = pk
+    if old_date not in report_ids or new_date not in report_ids:
+        return None
+    old_id, new_id = report_ids[old_date], report_ids[new_date]
+
+    scores = AssessmentScore.objects.filter(report_id__in=[old_id, new_id]).values(
+        "report_id",
+        "assessment_id",
+        "assessment__name",
+        "assessment__assessment_type",
+        "assessment__unit",
+        "value",
+        "choice_id",
+        "choice__choice",
+        "is_passing",
+        "did_not_test",
+    )
+
+    assessments = {}
+    for row in scores:
+        entry = assessments.setdefault(row["assessment_id"], {
+            "id": row["assessment_id"],
+            "name": row["assessment__name"],
+            "type": row["assessment__assessment_type"],
+            "unit": row["assessment__unit"],
+            "old": None,
+            "new": None,
+        })
+        side = "old" if row["report_id"] == old_id else "new"
+        entry[side] = {"score": _score(row), "passed": row["is_passing"], "did_not_test": row["did_not_test"]}
+
+    comparison = []
+    for assessment_id in sorted(assessments):
+        entry = assessments[assessment_id]
+        old, new = entry["old"], entry["new"]
+        delta = None
+        if entry["type"] == "quantitative" and _transition(old, new) is not None:
+            delta = new["score"] - old["score"]
+        comparison.append({**entry, "delta": delta, "transition": _transition(old, new)})
+    return comparison
+
+
+def _report_counts(report_ids):
+    """Passed, failed and not tested counts per report, in one grouped query."""
+    return AssessmentScore.objects.filter(report_id__in=report_ids).order_by().values("report_id").annotate(
+        passed=Count("pk", filter=Q(is_passing=True, did_not_test=False)),
+        failed=Count("pk", filter=Q(is_passing=False, did_not_test=False)),
+        did_not_test=Count("pk", filter=Q(did_not_test=True)),
+    )
+
+
+def trainer_dashboard():
+    """
+    Every athlete with their latest report of each template and its pass and fail counts.
+
+    The latest reports are picked with a window function and the counts are
+    conditional aggregates over the score table, three queries in all.
+    """
+    # Like get_report, the first report of a date is the one shown
+    latest_reports = Report.objects.annotate(
+        row=Window(
+            RowNumber(),
+            partition_by=[F("user_id"), F("template_id")],
+            order_by=[F("creation_date").desc(), F("id").asc()]
+        )
+    ).filter(row=1)
+
+    counts = {
+        row["report_id"]: {"passed": row["passed"], "failed": row["failed"], "did_not_test": row["did_not_test"]}
+        for row in _report_counts(latest_reports.values("pk"))
+    }
+
+    athletes = {
+        athlete["id"]: {**athlete, "reports": []}
+        for athlete in get_user_model().objects.filter(is_staff=False).order_by(
+            "last_name", "first_name", "id"
+        ).values("id", "email", "first_name", "last_name")
+    }
+    for report in latest_reports.values(
+        "pk",
+        "user_id",
+        "template_id",
+        "template__name",
+        "creation_date"
+    ).order_by("template__name", "template_id"):
+        if report["user_id"] not in athletes:
+            continue
+        athletes[report["user_id"]]["reports"].append({
+            "report": report["pk"],
+            "template": report["template_id"],
+            "template_name": report["template__name"],
+            "creation_date": report["creation_date"],
+            **counts.get(report["pk"], {"passed": 0, "failed": 0, "did_not_test": 0}),
+        })
+    return list(athletes.values())
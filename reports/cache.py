@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.cache import cache
+from athlete_hub_api.cache import bump_version, get_version, get_versions
+
+TEMPLATE_FORM_VERSION_KEY = "reports:template-form-version"
+TEMPLATE_FORM_TIMEOUT = 60 * 60 * 24
+REPORTS_VERSION_KEY = "reports:version"
+RECOMMENDATIONS_TIMEOUT = 60 * 60 * 24
+
+
+def template_form_key(template_pk):
+    return f"reports:template-form:{get_version(TEMPLATE_FORM_VERSION_KEY)}:{template_pk}"
+
+
+def get_template_form(template_pk, build):
+    """
+    Return the cached assessment form of a template, building it on a miss.
+
+    The key is taken before building, so a form read while an edit commits
+    is stored under the version that edit replaced and is never served.
+    """
+    key = template_form_key(template_pk)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=TEMPLATE_FORM_TIMEOUT)
+    return data
+
+
+def invalidate_template_forms():
+    bump_version(TEMPLATE_FORM_VERSION_KEY)
+
+
+def user_reports_version_key(user_id):
+    return f"reports:user-version:{user_id}"
+
+
+def invalidate_reports():
+    """Invalidate the reports of every user, for edits to assessments, drills or templates."""
+    bump_version(REPORTS_VERSION_KEY)
+
+
+def invalidate_user_reports(user_id):
+    bump_version(user_reports_version_key(user_id))
+
+
+def user_reports_etag(user_id):
+    """
+    ETag for the report endpoints of one user, built from version counters
+    without touching the database.
+    """
+    reports_version, user_version = get_versions(REPORTS_VERSION_KEY, user_reports_version_key(user_id))
+    return f"{user_id}-{reports_version}-{user_version}"
+
+
+def get_report_recommendations(user_id, template_id, creation_date, build):
+    """
+    Return the cached drill recommendations of a report, building them on a miss.
+
+    Recommendations depend on the athlete's whole history, so they are keyed
+    by the same versions as the athlete's report ETag. A None result, for a
+    report that does not exist, is not cached.
+    """
+    key = f"reports:recommendations:{user_reports_etag(user_id)}:{template_id}:{creation_date.isoformat()}"
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        if data is not None:
+            cache.set(key, data, timeout=RECOMMENDATIONS_TIMEOUT)
+    return data
+
+
+def get_trainer_dashboard(build):
+    """
+    Return the trainer dashboard, cached for TRAINER_DASHBOARD_CACHE_TIMEOUT seconds.
+
+    It covers every athlete, so it is not invalidated by score changes and
+    may be that many seconds old.
+    """
+    timeout = settings.TRAINER_DASHBOARD_CACHE_TIMEOUT
+    if not timeout:
+        return build()
+    key = f"reports:trainer-dashboard:{get_version(REPORTS_VERSION_KEY)}"
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=timeout)
+    return data
@@ -0,0 +1,84 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import AssessmentScore
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = [
+    "report_id",
+    "creation_date",
+    "template",
+    "user_id",
+    "email",
+    "assessment_id",
+    "assessment",
+    "assessment_type",
+    "unit",
+    "score",
+    "passed",
+    "did_not_test",
+]
+_SHARED_FIELDS = [
+    "report_id",
+    "report__creation_date",
+    "report__template__name",
+    "user_id",
+    "user__email",
+    "assessment_id",
+    "assessment__name",
+    "assessment__assessment_type",
+    "assessment__unit",
+]
+
+
+def _filter(queryset, template_id=None, user_id=None, start=None, end=None):
+    if template_id is not None:
+        queryset = queryset.filter(report__template_id=template_id)
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    if start is not None:
+        queryset = queryset.filter(report__creation_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(report__creation_date__lte=end)
+    return queryset
+
+
+def score_rows(chunk_size=EXPORT_CHUNK_SIZE, **filters):
+    """
+    Yield every matching score as a tuple in EXPORT_COLUMNS order.
+
+    Rows are read through iterator(), which uses a server-side cursor on
+    postgres, so only chunk_size rows are held in memory at a time.
+    """
+    scores = _filter(AssessmentScore.objects.all(), **filters).values_list(
+        *_SHARED_FIELDS, "value", "choice__choice", "is_passing", "did_not_test"
+    ).order_by("report_id", "assessment_id")
+
+    for *shared, value, choice, is_passing, did_not_test in scores.iterator(chunk_size=chunk_size):
+        yield (*shared, choice if value is None else value, is_passing, did_not_test)
+
+
+class _Echo:
+    """File-like object that hands back what is written to it, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def export_lines(export_format, rows):
+    if export_format == "csv":
+        return csv_lines(rows)
+    return ndjson_lines(rows)
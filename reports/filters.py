@@ -0,0 +1,13 @@
+from django_filters import rest_framework as filters
+from .models import Report
+
+
+class ReportFilter(filters.FilterSet):
+    athlete = filters.NumberFilter(field_name="user")
+    template = filters.NumberFilter(field_name="template")
+    start = filters.DateFilter(field_name="creation_date", lookup_expr="gte")
+    end = filters.DateFilter(field_name="creation_date", lookup_expr="lte")
+
+    class Meta:
+        model = Report
+        fields = ["athlete", "template", "start", "end"]
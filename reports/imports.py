@@ -0,0 +1,265 @@
+import csv
+import datetime
+import json
+from decimal import InvalidOperation
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from .cache import invalidate_user_reports
+from .models import (
+    Assessment,
+    AssessmentScore,
+    AssessmentScoreDistribution,
+    Report,
+    ReportImportCheckpoint,
+    ReportTemplate,
+    QualitativeAssessmentChoices,
+)
+from .services import invalidate_snapshots, score_value
+
+IMPORT_COLUMNS = ("email", "template", "date", "assessment", "value")
+TRUE_VALUES = ("1", "true", "yes", "y")
+
+
+class ImportRowError(Exception):
+    """Raised for an import row that can not be turned into a score."""
+    pass
+
+
+def read_rows(path, file_format):
+    """
+    Yield the rows of a CSV or JSONL file one at a time, as dicts for CSV
+    and as the undecoded lines for JSONL.
+
+    JSONL lines are decoded by parse_row, so a malformed line is reported
+    and skipped like any other invalid row instead of stopping the import.
+    """
+    with open(path, newline="") as source:
+        if file_format == "csv":
+            yield from csv.DictReader(source)
+        else:
+            for line in source:
+                if line.strip():
+                    yield line
+
+
+def copy_available():
+    """COPY is used through psycopg 3, which is the driver in requirements.txt."""
+    if connection.vendor != "postgresql":
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+    return is_psycopg3
+
+
+class ReportImporter:
+    """
+    Import scores into reports in batched transactions.
+
+    Users, templates, assessments and choices are loaded into lookup maps
+    once. Each batch finds or creates its reports, writes its scores with
+    COPY on postgres (bulk_create elsewhere) and saves the checkpoint in
+    the same transaction, so a failed import resumes after the last
+    committed batch.
+    """
+
+    def __init__(self, source, batch_size=5000):
+        self.source = source
+        self.batch_size = batch_size
+        self.use_copy = copy_available()
+        self.load_lookups()
+
+    def load_lookups(self):
+        self.users = {
+            email.lower(): pk
+            for pk, email in get_user_model().objects.values_list("pk", "email")
+        }
+        self.templates = dict(ReportTemplate.objects.values_list("name", "pk"))
+
+        assessments = Assessment.objects.select_related("quantitative_details", "qualitative_details").in_bulk()
+        self.assessments = {
+            (template_id, assessments[assessment_id].name): assessments[assessment_id]
+            for template_id, assessment_id in ReportTemplate.assessments.through.objects.values_list(
+                "reporttemplate_id", "assessment_id"
+            )
+        }
+        self.choices = {
+            (assessment_id, choice): pk
+            for pk, assessment_id, choice in QualitativeAssessmentChoices.objects.values_list("pk", "assessment_id", "choice")
+        }
+
+    def checkpoint(self):
+        checkpoint, _ = ReportImportCheckpoint.objects.get_or_create(source=self.source)
+        return checkpoint.rows
+
+    def reset_checkpoint(self):
+        ReportImportCheckpoint.objects.filter(source=self.source).delete()
+
+    def parse_row(self, row):
+        """Validate a row and resolve it to ids, raising ImportRowError when it is invalid."""
+        if isinstance(row, str):
+            try:
+                row = json.loads(row)
+            except json.JSONDecodeError:
+                raise ImportRowError("Invalid JSON")
+        if not isinstance(row, dict):
+            raise ImportRowError("Row is not an object")
+        # JSONL values may be numbers or booleans
+        row = {column: str(value) for column, value in row.items() if value is not None}
+
+        missing = [column for column in IMPORT_COLUMNS if not row.get(column)]
+        if missing:
+            raise ImportRowError(f"Missing {', '.join(missing)}")
+
+        user_id = self.users.get(row["email"].strip().lower())
+        if user_id is None:
+            raise ImportRowError(f"Unknown user {row['email']}")
+        template_id = self.templates.get(row["template"])
+        if template_id is None:
+            raise ImportRowError(f"Unknown template {row['template']}")
+        assessment = self.assessments.get((template_id, row["assessment"]))
+        if assessment is None:
+            raise ImportRowError(f"Unknown assessment {row['assessment']} for template {row['template']}")
+        try:
+            date = datetime.datetime.strptime(row["date"], "%Y-%m-%d").date()
+        except ValueError:
+            raise ImportRowError(f"Invalid date {row['date']}. Expected YYYY-MM-DD.")
+
+        did_not_test = row.get("did_not_test", "").strip().lower() in TRUE_VALUES
+
+        if assessment.assessment_type == "quantitative":
+            try:
+                value = score_value(row["value"])
+            except InvalidOperation:
+                raise ImportRowError(f"Invalid score {row['value']}")
+            except ValueError:
+                raise ImportRowError(f"Score {row['value']} is out of range")
+            is_passing = assessment.quantitative_details.grade(value)
+        else:
+            value = self.choices.get((assessment.pk, row["value"]))
+            if value is None:
+                raise ImportRowError(f"Unknown choice {row['value']} for {assessment.name}")
+            is_passing = assessment.qualitative_details.grade(value)
+
+        return (user_id, template_id, date), assessment, value, did_not_test, is_passing
+
+    def import_rows(self, rows, on_error=None, on_batch=None):
+        """
+        Import rows after the checkpoint. Returns (imported, skipped) row counts.
+
+        on_error is called with the row number and message of each invalid
+        row, on_batch with the number of rows committed so far.
+        """
+        done = self.checkpoint()
+        rows = islice(rows, done, None)
+        imported = skipped = 0
+
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+
+            parsed = []
+            errors = []
+            for number, row in enumerate(batch, start=done + 1):
+                try:
+                    parsed.append((number, self.parse_row(row)))
+                except ImportRowError as e:
+                    errors.append((number, str(e)))
+
+            done += len(batch)
+            with transaction.atomic():
+                duplicates = self.write_batch(parsed)
+                ReportImportCheckpoint.objects.filter(source=self.source).update(rows=done)
+            errors.extend(duplicates)
+            imported += len(parsed) - len(duplicates)
+            skipped += len(errors)
+            if on_error:
+                for number, message in sorted(errors):
+                    on_error(number, message)
+            if on_batch:
+                on_batch(done)
+
+        return imported, skipped
+
+    def get_reports(self, keys):
+        """Map (user, template, date) keys to report ids, creating the reports that do not exist."""
+        existing = Report.objects.filter(
+            user_id__in={key[0] for key in keys},
+            template_id__in={key[1] for key in keys},
+            creation_date__in={key[2] for key in keys},
+        ).values_list("user_id", "template_id", "creation_date", "pk").order_by("pk")
+        reports = {}
+        for user_id, template_id, creation_date, pk in existing:
+            key = (user_id, template_id, creation_date)
+            if key in keys:
+                reports.setdefault(key, pk)
+
+        # Existing reports get new scores, so their snapshots are out of date
+        invalidate_snapshots(Report.objects.filter(pk__in=reports.values()))
+
+        new_reports = Report.objects.bulk_create([
+            Report(user_id=key[0], template_id=key[1], creation_date=key[2])
+            for key in keys if key not in reports
+        ], batch_size=self.batch_size)
+        reports.update({
+            (report.user_id, report.template_id, report.creation_date): report.pk
+            for report in new_reports
+        })
+        return reports
+
+    def write_batch(self, parsed):
+        """
+        Write the scores of (row number, parsed row) pairs.
+
+        A report has one score per assessment, so rows whose report already
+        has a score for their assessment are skipped, whether it was entered
+        in the app, imported by an earlier run or by an earlier row. Returns
+        (row number, message) for each of them.
+        """
+        if not parsed:
+            return []
+        reports = self.get_reports({key for _, (key, *_) in parsed})
+        scored = set(AssessmentScore.objects.filter(
+            report_id__in=reports.values()
+        ).values_list("report_id", "assessment_id"))
+
+        rows = []
+        duplicates = []
+        quantitative_ids = set()
+        for number, (key, assessment, value, did_not_test, is_passing) in parsed:
+            report_id = reports[key]
+            if (report_id, assessment.pk) in scored:
+                duplicates.append((number, f"Report already has a score for {assessment.name}"))
+                continue
+            scored.add((report_id, assessment.pk))
+            if assessment.assessment_type == "quantitative":
+                quantitative_ids.add(assessment.pk)
+                rows.append((assessment.pk, key[0], report_id, value, None, did_not_test, is_passing))
+            else:
+                rows.append((assessment.pk, key[0], report_id, None, value, did_not_test, is_passing))
+
+        self.insert_scores(rows)
+
+        # Imported scores are not merged one by one, the distributions are rebuilt on their next read
+        AssessmentScoreDistribution.objects.filter(
+            assessment_id__in=quantitative_ids
+        ).update(stale=True)
+        for user_id in {key[0] for key in reports}:
+            invalidate_user_reports(user_id)
+        return duplicates
+
+    def insert_scores(self, rows):
+        columns = ["assessment_id", "user_id", "report_id", "value", "choice_id", "did_not_test", "is_passing"]
+        if not rows:
+            return
+        if self.use_copy:
+            table = connection.ops.quote_name(AssessmentScore._meta.db_table)
+            with connection.cursor() as cursor:
+                with cursor.cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+        else:
+            AssessmentScore.objects.bulk_create(
+                [AssessmentScore(**dict(zip(columns, row))) for row in rows],
+                batch_size=self.batch_size
+            )
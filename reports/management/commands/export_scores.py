@@ -0,0 +1,40 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from reports.exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_lines, score_rows
+
+
+def parse_date(value):
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise CommandError(f"Invalid date {value}. Expected YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = "Stream every assessment score matching the filters as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--template", type=int, help="Report template id")
+        parser.add_argument("--user", type=int, help="Athlete id")
+        parser.add_argument("--start", type=parse_date, help="First report date, YYYY-MM-DD")
+        parser.add_argument("--end", type=parse_date, help="Last report date, YYYY-MM-DD")
+        parser.add_argument("--output", help="File to write to instead of stdout")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        rows = score_rows(
+            chunk_size=options["chunk_size"],
+            template_id=options["template"],
+            user_id=options["user"],
+            start=options["start"],
+            end=options["end"],
+        )
+        lines = export_lines(options["format"], rows)
+
+        if options["output"]:
+            with open(options["output"], "w", newline="") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,50 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from reports.imports import ReportImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import historical scores from a CSV or JSONL file with the columns "
+        "email, template, date, assessment, value and optionally did_not_test. "
+        "Rows of the same athlete, template and date go into one report, "
+        "rows for an assessment the report already has a score for are skipped. "
+        "An interrupted import resumes after the last committed batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "jsonl"), help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--source", help="Checkpoint name, defaults to the absolute file path")
+        parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and import from the first row")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist")
+        file_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "jsonl")
+
+        importer = ReportImporter(options["source"] or os.path.abspath(path), batch_size=options["batch_size"])
+        if options["restart"]:
+            importer.reset_checkpoint()
+        start_row = importer.checkpoint()
+        if start_row:
+            self.stdout.write(f"Resuming after row {start_row}")
+
+        started = time.monotonic()
+
+        def on_error(number, message):
+            self.stderr.write(f"Row {number}: {message}")
+
+        def on_batch(done):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"{done} rows committed, {(done - start_row) / elapsed:.0f} rows/s")
+
+        imported, skipped = importer.import_rows(read_rows(path, file_format), on_error=on_error, on_batch=on_batch)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} scores, skipped {skipped} invalid rows in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from reports.services import REGRADE_CHUNK_SIZE, pending_regrades, regrade_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Finish the regrade of every assessment whose passing score changed "
+        "and whose regrade did not complete, for example because the request "
+        "running it timed out."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=REGRADE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        assessments = 0
+        for details in pending_regrades():
+            changed = regrade_scores(details, chunk_size=options["chunk_size"])
+            self.stdout.write(f"{details.assessment.name}: {changed} scores changed state")
+            assessments += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Regraded {assessments} assessments"))
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0009_templateassessmentrelationship"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="qualitativeassessmentscore",
+            index=models.Index(fields=["report", "assessment"], name="qual_score_report_assess_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="quantitativeassessmentscore",
+            index=models.Index(fields=["report", "assessment"], name="quant_score_report_assess_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(fields=["user", "template", "creation_date"], name="report_user_template_date_idx"),
+        ),
+    ]
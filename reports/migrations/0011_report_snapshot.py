@@ -0,0 +1,19 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:38
+
+from django.db import migrations, models
+import rest_framework.utils.encoders
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0010_report_and_score_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="report",
+            name="snapshot",
+            field=models.JSONField(blank=True, editable=False, encoder=rest_framework.utils.encoders.JSONEncoder, null=True),
+        ),
+    ]
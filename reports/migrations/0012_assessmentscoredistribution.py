@@ -0,0 +1,24 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0011_report_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssessmentScoreDistribution",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("values", models.JSONField(default=list)),
+                ("cumulative_counts", models.JSONField(default=list)),
+                ("stale", models.BooleanField(default=True)),
+                ("assessment", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="score_distribution", to="reports.assessment")),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0012_assessmentscoredistribution"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportImportCheckpoint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("source", models.CharField(max_length=255, unique=True)),
+                ("rows", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0013_reportimportcheckpoint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(fields=["-creation_date", "-id"], name="report_date_id_idx"),
+        ),
+    ]
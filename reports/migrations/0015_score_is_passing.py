@@ -0,0 +1,45 @@
+# Generated by Django 4.2.5 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+def grade_scores(apps, schema_editor):
+    """Scores default to failing, so only the passing ones are written, one assessment at a time."""
+    QuantitativeAssessment = apps.get_model("reports", "QuantitativeAssessment")
+    QuantitativeAssessmentScore = apps.get_model("reports", "QuantitativeAssessmentScore")
+    QualitativeAssessment = apps.get_model("reports", "QualitativeAssessment")
+    QualitativeAssessmentScore = apps.get_model("reports", "QualitativeAssessmentScore")
+
+    for details in QuantitativeAssessment.objects.all():
+        lookup = "exact" if details.passing_condition == "eq" else details.passing_condition
+        QuantitativeAssessmentScore.objects.filter(
+            quantitative_assessment=details,
+            **{f"score__{lookup}": details.passing_score}
+        ).update(is_passing=True)
+
+    for details in QualitativeAssessment.objects.all():
+        QualitativeAssessmentScore.objects.filter(
+            qualitative_assessment=details,
+            score_id=details.passing_score_id
+        ).update(is_passing=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0014_report_date_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="qualitativeassessmentscore",
+            name="is_passing",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name="quantitativeassessmentscore",
+            name="is_passing",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(grade_scores, migrations.RunPython.noop),
+    ]
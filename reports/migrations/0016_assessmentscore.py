@@ -0,0 +1,101 @@
+# Generated by Django 4.2.5 on 2026-10-18 09:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 2000
+
+
+def copy_scores(apps, schema_editor):
+    """Copy both score tables into the unified one, a batch at a time."""
+    AssessmentScore = apps.get_model("reports", "AssessmentScore")
+    QuantitativeAssessmentScore = apps.get_model("reports", "QuantitativeAssessmentScore")
+    QualitativeAssessmentScore = apps.get_model("reports", "QualitativeAssessmentScore")
+
+    fields = ("assessment_id", "user_id", "report_id", "did_not_test", "is_passing")
+    for model, value_fields in (
+        (QuantitativeAssessmentScore, {"value": "score"}),
+        (QualitativeAssessmentScore, {"choice_id": "score_id"}),
+    ):
+        batch = []
+        for row in model.objects.order_by("pk").values(*fields, *value_fields.values()).iterator(chunk_size=BATCH_SIZE):
+            batch.append(AssessmentScore(
+                **{field: row[field] for field in fields},
+                **{new: row[old] for new, old in value_fields.items()}
+            ))
+            if len(batch) == BATCH_SIZE:
+                AssessmentScore.objects.bulk_create(batch)
+                batch = []
+        AssessmentScore.objects.bulk_create(batch)
+
+
+def split_scores(apps, schema_editor):
+    """Copy the unified score table back into the quantitative and qualitative ones."""
+    AssessmentScore = apps.get_model("reports", "AssessmentScore")
+    QuantitativeAssessment = apps.get_model("reports", "QuantitativeAssessment")
+    QualitativeAssessment = apps.get_model("reports", "QualitativeAssessment")
+    QuantitativeAssessmentScore = apps.get_model("reports", "QuantitativeAssessmentScore")
+    QualitativeAssessmentScore = apps.get_model("reports", "QualitativeAssessmentScore")
+
+    quantitative_details = dict(QuantitativeAssessment.objects.values_list("assessment_id", "pk"))
+    qualitative_details = dict(QualitativeAssessment.objects.values_list("assessment_id", "pk"))
+    for score in AssessmentScore.objects.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+        shared = {
+            "assessment_id": score.assessment_id,
+            "user_id": score.user_id,
+            "report_id": score.report_id,
+            "did_not_test": score.did_not_test,
+            "is_passing": score.is_passing,
+        }
+        if score.choice_id is None:
+            QuantitativeAssessmentScore.objects.create(
+                quantitative_assessment_id=quantitative_details[score.assessment_id],
+                score=score.value,
+                **shared
+            )
+        else:
+            QualitativeAssessmentScore.objects.create(
+                qualitative_assessment_id=qualitative_details[score.assessment_id],
+                score_id=score.choice_id,
+                **shared
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("reports", "0015_score_is_passing"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssessmentScore",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("value", models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ("did_not_test", models.BooleanField(default=False)),
+                ("is_passing", models.BooleanField(default=False, editable=False)),
+                ("assessment", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="scores", to="reports.assessment")),
+                ("choice", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to="reports.qualitativeassessmentchoices")),
+                ("report", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="scores", to="reports.report")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="assessmentscore",
+            index=models.Index(fields=["report", "assessment"], name="score_report_assessment_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="assessmentscore",
+            constraint=models.CheckConstraint(check=models.Q(models.Q(("choice__isnull", True), ("value__isnull", False)), models.Q(("choice__isnull", False), ("value__isnull", True)), _connector="OR"), name="score_value_or_choice"),
+        ),
+        migrations.RunPython(copy_scores, split_scores),
+        migrations.DeleteModel(
+            name="QualitativeAssessmentScore",
+        ),
+        migrations.DeleteModel(
+            name="QuantitativeAssessmentScore",
+        ),
+    ]
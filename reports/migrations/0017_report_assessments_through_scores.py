@@ -0,0 +1,39 @@
+# Generated by Django 4.2.5 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def restore_links(apps, schema_editor):
+    """Rebuild the report/assessment link table from the score rows."""
+    AssessmentScore = apps.get_model("reports", "AssessmentScore")
+    Report = apps.get_model("reports", "Report")
+    Through = Report.assessments.through
+
+    links = AssessmentScore.objects.values_list("report_id", "assessment_id").distinct().order_by()
+    Through.objects.bulk_create([
+        Through(report_id=report_id, assessment_id=assessment_id)
+        for report_id, assessment_id in links.iterator(chunk_size=BATCH_SIZE)
+    ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0016_assessmentscore"),
+    ]
+
+    operations = [
+        # Runs last when reversed, once the link table exists again
+        migrations.RunPython(migrations.RunPython.noop, restore_links),
+        migrations.RemoveField(
+            model_name="report",
+            name="assessments",
+        ),
+        migrations.AddField(
+            model_name="report",
+            name="assessments",
+            field=models.ManyToManyField(related_name="reports", through="reports.AssessmentScore", to="reports.assessment"),
+        ),
+    ]
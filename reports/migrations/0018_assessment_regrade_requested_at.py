@@ -0,0 +1,18 @@
+# Generated by Django 4.2.5 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0017_report_assessments_through_scores"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assessment",
+            name="regrade_requested_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
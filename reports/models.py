@@ -1,12 +1,24 @@
+from collections import defaultdict
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+from athlete_hub_api.distributions import ValueDistribution
 
 class NoPassingCondition(Exception):
     """Custom exception thrown when no condition is given"""
     pass
 
+class AssessmentScoreQuerySet(models.QuerySet):
+    def passing(self):
+        return self.filter(is_passing=True)
+
+    def failing(self):
+        return self.filter(is_passing=False)
+
+
 # Create your models here.
 class Assessment(models.Model):
     ASSESSMENT_TYPE_CHOICES = [
@@ -18,6 +30,8 @@ class Assessment(models.Model):
     assessment_type = models.CharField(max_length=50, choices=ASSESSMENT_TYPE_CHOICES)
     description = models.TextField(null=True, blank=True)
     unit = models.CharField(max_length=50, null=True, blank=True, default=None)
+    # Set when the passing score changes and cleared once every score is regraded
+    regrade_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.name} assessment"
@@ -35,7 +49,16 @@ class Report(models.Model):
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
     template = models.ForeignKey(ReportTemplate, on_delete=models.CASCADE)
     creation_date = models.DateField(default=timezone.now)
-    assessments = models.ManyToManyField(Assessment, related_name="reports")
+    # Derived from the report's score rows, a report has an assessment once it has a score for it
+    assessments = models.ManyToManyField(Assessment, through="AssessmentScore", related_name="reports")
+    # The rendered report payload, cleared whenever something it depends on changes
+    snapshot = models.JSONField(null=True, blank=True, editable=False, encoder=JSONEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "template", "creation_date"], name="report_user_template_date_idx"),
+            models.Index(fields=["-creation_date", "-id"], name="report_date_id_idx"),
+        ]
 
     def __str__(self):
         return f"Report for {self.user.first_name + ' ' + self.user.last_name} made from {self.template.name}"
@@ -56,6 +79,25 @@ class QuantitativeAssessment(models.Model):
 
     def __str__(self):
         return f"Quantitative details for {self.assessment.name}"
+
+    def grade(self, score):
+        if self.passing_condition == "eq":
+            return score == self.passing_score
+        elif self.passing_condition == "gt":
+            return score > self.passing_score
+        elif self.passing_condition == "gte":
+            return score >= self.passing_score
+        elif self.passing_condition == "lt":
+            return score < self.passing_score
+        elif self.passing_condition == "lte":
+            return score <= self.passing_score
+        else:
+            raise NoPassingCondition("No passing condition was defined")
+
+    def passing_filter(self):
+        """Q object matching the scores that pass, for grading in the database."""
+        lookup = "exact" if self.passing_condition == "eq" else self.passing_condition
+        return Q(**{f"value__{lookup}": self.passing_score})
     
     def clean(self):
         if self.assessment.assessment_type != 'quantitative':
@@ -66,32 +108,6 @@ class QuantitativeAssessment(models.Model):
         super(QuantitativeAssessment, self).save(*args, **kwargs)
 
 
-class QuantitativeAssessmentScore(models.Model):
-    assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE)
-    quantitative_assessment = models.ForeignKey(QuantitativeAssessment, on_delete=models.CASCADE)
-    user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
-    report = models.ForeignKey(Report, on_delete=models.CASCADE)
-    score = models.DecimalField(max_digits=5, decimal_places=2)
-    did_not_test = models.BooleanField(default=False)
-
-    def __str__(self):
-        return f"{self.user.first_name + ' ' + self.user.last_name}'s score for {self.assessment} for report {self.report.template.name}"
-
-    def passed(self):
-        if self.quantitative_assessment.passing_condition == "eq":
-            return self.score == self.quantitative_assessment.passing_score
-        elif self.quantitative_assessment.passing_condition == "gt":
-            return self.score > self.quantitative_assessment.passing_score
-        elif self.quantitative_assessment.passing_condition == "gte":
-            return self.score >= self.quantitative_assessment.passing_score
-        elif self.quantitative_assessment.passing_condition == "lt":
-            return self.score < self.quantitative_assessment.passing_score
-        elif self.quantitative_assessment.passing_condition == "lte":
-            return self.score <= self.quantitative_assessment.passing_score
-        else:
-            raise NoPassingCondition("No passing condition was defined")
-
-
 class QualitativeAssessmentChoices(models.Model):
     assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE, related_name="choices")
     choice = models.CharField(max_length=100)
@@ -118,6 +134,13 @@ class QualitativeAssessment(models.Model):
 
     def __str__(self):
         return f"Qualitative assessment details for {self.assessment.name}"
+
+    def grade(self, choice_id):
+        return choice_id == self.passing_score_id
+
+    def passing_filter(self):
+        """Q object matching the scores that pass, for grading in the database."""
+        return Q(choice_id=self.passing_score_id)
     
     def clean(self):
         if self.assessment.assessment_type != 'qualitative':
@@ -128,19 +151,59 @@ class QualitativeAssessment(models.Model):
         super(QualitativeAssessment, self).save(*args, **kwargs)
 
 
-class QualitativeAssessmentScore(models.Model):
-    assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE)
-    qualitative_assessment = models.ForeignKey(QualitativeAssessment, on_delete=models.CASCADE)
+class AssessmentScore(models.Model):
+    assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE, related_name="scores")
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
-    report = models.ForeignKey(Report, on_delete=models.CASCADE)
-    score = models.ForeignKey(QualitativeAssessmentChoices, on_delete=models.CASCADE)
+    report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name="scores")
+    # Quantitative assessments are scored with a value, qualitative ones with a choice
+    value = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    choice = models.ForeignKey(QualitativeAssessmentChoices, on_delete=models.CASCADE, null=True, blank=True)
     did_not_test = models.BooleanField(default=False)
+    # Graded when the score is written and regraded when the passing score changes
+    is_passing = models.BooleanField(default=False, editable=False)
+
+    objects = AssessmentScoreQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["report", "assessment"], name="score_report_assessment_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=Q(value__isnull=False, choice__isnull=True) | Q(value__isnull=True, choice__isnull=False),
+                name="score_value_or_choice"
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.user.first_name + ' ' + self.user.last_name}'s score for {self.assessment.name} for report {self.report.template.name}"
+        # Each score type keeps the text of the model it was split from
+        assessment = self.assessment if self.is_quantitative else self.assessment.name
+        return f"{self.user.first_name + ' ' + self.user.last_name}'s score for {assessment} for report {self.report.template.name}"
+
+    @property
+    def is_quantitative(self):
+        return self.choice_id is None
+
+    @property
+    def score(self):
+        """The value of a quantitative score or the choice name of a qualitative one."""
+        return self.value if self.is_quantitative else self.choice.choice
+
+    def save(self, *args, **kwargs):
+        self.is_passing = self.grade()
+        super(AssessmentScore, self).save(*args, **kwargs)
+
+    def grade(self):
+        """Grade the score as it will be stored, a value rounded to the column's decimal places."""
+        if not self.is_quantitative:
+            return self.assessment.qualitative_details.grade(self.choice_id)
+        field = self._meta.get_field("value")
+        return self.assessment.quantitative_details.grade(round(field.to_python(self.value), field.decimal_places))
 
     def passed(self):
-        return self.score == self.qualitative_assessment.passing_score
+        if self.is_quantitative:
+            return self.assessment.quantitative_details.grade(self.value)
+        return self.choice == self.assessment.qualitative_details.passing_score
 
 
 class Drill(models.Model):
@@ -162,3 +225,41 @@ class TemplateAssessmentRelationship(models.Model):
 
     def __str__(self):
         return f"Template: {self.template.name} | Assessment: {self.assessment.name} | Order: {self.order}"
+
+
+class AssessmentScoreDistribution(ValueDistribution):
+    """Summary of every tested quantitative score of an assessment."""
+    KEY_FIELDS = ("assessment_id",)
+
+    assessment = models.OneToOneField(Assessment, related_name="score_distribution", on_delete=models.CASCADE)
+
+    def __str__(self):
+        return f"Score distribution for {self.assessment.name}"
+
+    def value_counts(self):
+        return AssessmentScore.objects.filter(
+            assessment_id=self.assessment_id,
+            did_not_test=False
+        ).values_list("value").annotate(count=models.Count("id")).order_by("value")
+
+    @classmethod
+    def new_values(cls, rows):
+        values = defaultdict(list)
+        for score in rows:
+            if score.is_quantitative and not score.did_not_test:
+                values[(score.assessment_id,)].append(float(score.value))
+        return values
+
+    @classmethod
+    def stale_lookup(cls, row):
+        return {"assessment_id": row.assessment_id}
+
+
+class ReportImportCheckpoint(models.Model):
+    """How many rows of an import file are committed, saved with each batch so a failed import can resume."""
+    source = models.CharField(max_length=255, unique=True)
+    rows = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source}: {self.rows} rows imported"
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ReportCursorPagination(CursorPagination):
+    """
+    Newest reports first. The cursor seeks from the last row of the previous
+    page, so deep pages cost the same as the first one.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-creation_date", "-id")
@@ -6,3 +6,17 @@ class CustomPermission(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True  # Allow any read-only requests
         return request.user.is_staff  # Only allow writes for staff users
+
+
+class OwnDataPermission(permissions.BasePermission):
+    """
+    Staff can read the data of any athlete, athletes only their own, for
+    views taking the athlete as user_pk.
+
+    Checked before the view runs, so an athlete never gets a 304 for
+    another athlete's data either.
+    """
+    message = "Not allowed"
+
+    def has_permission(self, request, view):
+        return request.user.is_staff or request.user.pk == view.kwargs.get("user_pk")
@@ -0,0 +1,85 @@
+from django.db.models import Count, Q
+from .models import AssessmentScore
+from .services import get_report, report_assessments
+
+
+def shortfall(score, passing_score, passing_condition):
+    """
+    How far a failed quantitative score was from passing, relative to the
+    passing score. 0 for a score that sits on a strict threshold.
+    """
+    if passing_condition in ("gt", "gte"):
+        gap = passing_score - score
+    elif passing_condition in ("lt", "lte"):
+        gap = score - passing_score
+    else:
+        gap = abs(score - passing_score)
+    if passing_score:
+        gap /= abs(passing_score)
+    return max(float(gap), 0.0)
+
+
+def failure_history(report, assessment_ids):
+    """Map assessment id to (tested, failed) counts of the athlete up to the report date."""
+    counts = AssessmentScore.objects.filter(
+        user_id=report.user_id,
+        assessment_id__in=assessment_ids,
+        report__creation_date__lte=report.creation_date,
+        did_not_test=False
+    ).order_by().values("assessment_id").annotate(
+        tested=Count("pk"),
+        failed=Count("pk", filter=Q(is_passing=False))
+    )
+    return {row["assessment_id"]: (row["tested"], row["failed"]) for row in counts}
+
+
+def recommend_drills(report):
+    """
+    Drills for the assessments failed on a report, most needed first.
+
+    Assessments are ranked by their shortfall, capped at 1, plus the share
+    of the athlete's tests of that assessment they failed so far. A failed
+    qualitative assessment counts as a full shortfall.
+    """
+    failed = []
+    for assessment in report_assessments(report):
+        score = assessment.report_scores[0]
+        if not score.did_not_test and not score.is_passing:
+            failed.append((assessment, score))
+
+    history = failure_history(report, [assessment.pk for assessment, _ in failed])
+
+    recommendations = []
+    for assessment, score in failed:
+        if assessment.assessment_type == "quantitative":
+            details = assessment.quantitative_details
+            gap = shortfall(score.value, details.passing_score, details.passing_condition)
+        else:
+            gap = 1.0
+        tested, failed_count = history.get(assessment.pk, (1, 1))
+        fail_rate = failed_count / tested
+
+        recommendations.append({
+            "assessment": assessment.pk,
+            "name": assessment.name,
+            "shortfall": round(gap, 4),
+            "fail_rate": round(fail_rate, 4),
+            "times_failed": failed_count,
+            "times_tested": tested,
+            "priority": round(min(gap, 1.0) + fail_rate, 4),
+            "drills": [
+                {"name": drill.name, "drill_url": drill.url}
+                for drill in assessment.drills.all()
+            ],
+        })
+
+    recommendations.sort(key=lambda recommendation: (-recommendation["priority"], recommendation["name"]))
+    return recommendations
+
+
+def get_recommendations(user_id, template_id, creation_date):
+    """Drill recommendations of a report, or None if there is no such report."""
+    report = get_report(user_id, template_id, creation_date)
+    if report is None:
+        return None
+    return recommend_drills(report)
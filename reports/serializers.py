@@ -2,9 +2,8 @@ from rest_framework import serializers
 from .models import (
     Assessment,
     ReportTemplate,
+    AssessmentScore,
     QualitativeAssessmentChoices,
-    QualitativeAssessmentScore,
-    QuantitativeAssessmentScore,
     Report
 )
 
@@ -32,15 +31,9 @@ class QualitativeAssessmentJustChoicesSerializer(serializers.ModelSerializer):
         fields = ["id", "choice"]
 
 
-class QualitativeAssessmentScoreSerializer(serializers.ModelSerializer):
+class AssessmentScoreSerializer(serializers.ModelSerializer):
     class Meta:
-        model = QualitativeAssessmentScore
-        fields = "__all__"
-
-
-class QuantitativeAssessmentScoreSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = QuantitativeAssessmentScore
+        model = AssessmentScore
         fields = "__all__"
 
 
@@ -64,3 +57,20 @@ class AssessmentWithChoicesSerializer(serializers.ModelSerializer):
             choices = obj.choices.all()
             return QualitativeAssessmentJustChoicesSerializer(choices, many=True).data
         return None
+
+
+class ReportListSerializer(serializers.ModelSerializer):
+    email = serializers.EmailField(source="user.email", read_only=True)
+    template_name = serializers.CharField(source="template.name", read_only=True)
+    pass_rate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Report
+        fields = ["id", "user", "email", "template", "template_name", "creation_date", "pass_rate"]
+
+    def get_pass_rate(self, obj):
+        # Only set when the queryset was annotated with annotate_pass_counts
+        tested = getattr(obj, "tested_count", None)
+        if not tested:
+            return None
+        return round(obj.passed_count / tested, 4)
@@ -0,0 +1,320 @@
+from decimal import Decimal, InvalidOperation
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, FilteredRelation, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .cache import invalidate_user_reports
+from .models import (
+    Assessment,
+    AssessmentScore,
+    Report,
+    QualitativeAssessmentChoices,
+)
+
+
+def template_assessments(template):
+    """
+    Assessments of a template in TemplateAssessmentRelationship order, with their choices.
+
+    The order is joined in, assessments without an order come last.
+    """
+    return Assessment.objects.filter(report_templates=template).annotate(
+        template_relationship=FilteredRelation(
+            "templateassessmentrelationship",
+            condition=Q(templateassessmentrelationship__template=template)
+        )
+    ).order_by(
+        F("template_relationship__order").asc(nulls_last=True),
+        "id"
+    ).prefetch_related("choices")
+
+
+def get_report(user_id, template_id, creation_date):
+    """Return the report a user got from a template on a date, or None."""
+    return Report.objects.filter(
+        user_id=user_id,
+        template_id=template_id,
+        creation_date=creation_date
+    ).first()
+
+
+def get_report_data(user_id, template_id, creation_date):
+    """
+    Return the payload of a report, or None if there is no such report.
+
+    The payload is served from the report's snapshot. A report without one
+    is rendered and its snapshot stored for the next read.
+    """
+    report = get_report(user_id, template_id, creation_date)
+    if report is None:
+        return None
+    if report.snapshot is None:
+        return refresh_snapshot(report)
+    return report.snapshot
+
+
+def refresh_snapshot(report):
+    """Render a report and store the result as its snapshot."""
+    data = build_report_data(report)
+    Report.objects.filter(pk=report.pk).update(snapshot=data)
+    report.snapshot = data
+    return data
+
+
+def invalidate_snapshots(reports):
+    """Clear the snapshots of a report queryset so they are rebuilt on their next read."""
+    reports.exclude(snapshot__isnull=True).update(snapshot=None)
+
+
+def _score_count(scores):
+    """Correlated count of the scores of the outer report."""
+    counts = scores.filter(report=OuterRef("pk")).order_by().values("report").annotate(count=Count("pk")).values("count")
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def annotate_pass_counts(reports):
+    """
+    Annotate reports with tested_count and passed_count, the number of
+    assessments the athlete tested and passed.
+    """
+    tested = AssessmentScore.objects.filter(did_not_test=False)
+    return reports.annotate(
+        tested_count=_score_count(tested),
+        passed_count=_score_count(tested.passing()),
+    )
+
+
+def report_assessments(report):
+    """
+    Assessments of a report with everything needed to render it.
+
+    Details, passing choices, drills and the report's scores are loaded up
+    front, so the number of queries does not grow with the number of
+    assessments on the report. The assessments are joined through the
+    score rows, so they are made distinct, and returned in the order their
+    scores were saved.
+    """
+    scores = AssessmentScore.objects.filter(
+        report=report,
+        user_id=report.user_id
+    ).select_related("choice").order_by("pk")
+
+    assessments = report.assessments.distinct().select_related(
+        "quantitative_details",
+        "qualitative_details__passing_score"
+    ).prefetch_related(
+        "drills",
+        Prefetch("scores", queryset=scores, to_attr="report_scores"),
+    )
+    # Ordering by a score column in SQL would add it to the DISTINCT
+    return sorted(assessments, key=lambda assessment: assessment.report_scores[0].pk)
+
+
+def build_report_data(report):
+    """Build the per assessment payload returned by the report endpoints."""
+    data = []
+
+    for assessment in report_assessments(report):
+        if assessment.assessment_type == "quantitative":
+            passing_score = assessment.quantitative_details.passing_score
+        else:
+            passing_score = assessment.qualitative_details.passing_score.choice
+        score_obj = assessment.report_scores[0]
+
+        drills = [
+            {"name": drill.name, "drill_url": drill.url}
+            for drill in assessment.drills.all()
+        ]
+
+        data.append({
+            "name": assessment.name,
+            "type": assessment.assessment_type,
+            "description": assessment.description,
+            "unit": assessment.unit,
+            "passing_score": passing_score,
+            "score": score_obj.score,
+            "passed": score_obj.is_passing,
+            "did_not_test": score_obj.did_not_test,
+            "drills": drills
+        })
+
+    return data
+
+
+def _assessment_id(value):
+    """A submitted assessment id as an int, None when it is not one."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def resolve_assessments(assessment_ids):
+    """
+    Map assessment id to assessment for every id in assessment_ids.
+
+    Details and choices are loaded with the assessments so building scores
+    from a submitted form needs no further queries. Ids that are not
+    numbers are left out, so they resolve to no assessment.
+    """
+    ids = [_assessment_id(pk) for pk in assessment_ids]
+    return Assessment.objects.select_related(
+        "quantitative_details",
+        "qualitative_details"
+    ).prefetch_related("choices").in_bulk([pk for pk in ids if pk is not None])
+
+
+def score_value(value):
+    """
+    A submitted quantitative score as it will be stored, rounded to the
+    value column's decimal places.
+
+    Raises InvalidOperation when it is not a number and ValueError when
+    it does not fit the column.
+    """
+    field = AssessmentScore._meta.get_field("value")
+    value = Decimal(value)
+    try:
+        value = round(value, field.decimal_places)
+        field.run_validators(value)
+    except (InvalidOperation, ValidationError):
+        raise ValueError(f"Invalid score {value}")
+    return value
+
+
+def build_scores(report, assessments, did_not_test_ids, assessment_map):
+    """
+    Build unsaved score rows for the assessments of a submitted report form.
+
+    The report does not need to be saved yet, it only has to be saved
+    before the rows are passed to save_scores.
+
+    Raises Assessment.DoesNotExist, QualitativeAssessmentChoices.DoesNotExist,
+    ValueError or InvalidOperation for invalid submissions.
+    """
+    scores = []
+
+    for assessment_data in assessments.values():
+        assessment_obj = assessment_map.get(_assessment_id(assessment_data["id"]))
+        if assessment_obj is None:
+            raise Assessment.DoesNotExist("Assessment does not exists")
+        if assessment_data["type"] != assessment_obj.assessment_type:
+            raise ValueError("Assessment type")
+
+        score = AssessmentScore(
+            assessment=assessment_obj,
+            user=report.user,
+            report=report,
+            did_not_test=assessment_data["id"] in did_not_test_ids
+        )
+        if assessment_obj.assessment_type == "qualitative":
+            choice = assessment_data["value"]
+            score.choice = next(
+                (obj for obj in assessment_obj.choices.all() if obj.choice == choice),
+                None
+            )
+            if score.choice is None:
+                raise QualitativeAssessmentChoices.DoesNotExist("Choice does not exists")
+        else:
+            # Out of range values would otherwise only fail on insert
+            try:
+                score.value = score_value(assessment_data["value"])
+            except ValueError:
+                raise ValueError(f"Invalid score {assessment_data['value']} for {assessment_obj.name}")
+        scores.append(score)
+
+    return scores
+
+
+def save_scores(scores):
+    """
+    Grade score rows, then insert them in one statement.
+
+    bulk_create sends no signals, so callers merge the rows into the score
+    distributions with AssessmentScoreDistribution.record, as the last
+    step of their transaction.
+    """
+    # bulk_create does not call save(), which grades the scores
+    for score in scores:
+        score.is_passing = score.grade()
+
+    AssessmentScore.objects.bulk_create(scores)
+
+    # bulk_create sends no signals
+    for user_id in {score.user_id for score in scores}:
+        invalidate_user_reports(user_id)
+
+
+REGRADE_CHUNK_SIZE = 1000
+
+
+def _regrade_rows(scores, is_passing, chunk_size):
+    """
+    Set is_passing on every row of scores, chunk_size rows per transaction.
+    Returns the number of rows changed and the ids of their users.
+
+    Updated rows drop out of scores, so each chunk is read from the start.
+    """
+    count = 0
+    user_ids = set()
+    while True:
+        with transaction.atomic():
+            rows = list(scores.order_by("pk").values_list("pk", "report_id", "user_id")[:chunk_size])
+            if not rows:
+                return count, user_ids
+            AssessmentScore.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(is_passing=is_passing)
+            # update() sends no signals
+            invalidate_snapshots(Report.objects.filter(pk__in={report_id for _, report_id, _ in rows}))
+        count += len(rows)
+        user_ids.update(user_id for _, _, user_id in rows)
+
+
+def request_regrade(details):
+    """
+    Mark the assessment of details as needing a regrade.
+
+    The mark is cleared by regrade_scores once every score is regraded, so
+    a regrade that is cut short is resumed by the regrade_scores command.
+    """
+    Assessment.objects.filter(pk=details.assessment_id).update(regrade_requested_at=timezone.now())
+
+
+def pending_regrades():
+    """Passing score details of the assessments whose regrade has not finished."""
+    assessments = Assessment.objects.filter(
+        regrade_requested_at__isnull=False
+    ).select_related("quantitative_details", "qualitative_details").order_by("pk")
+    for assessment in assessments:
+        if assessment.assessment_type == "quantitative":
+            yield assessment.quantitative_details
+        else:
+            yield assessment.qualitative_details
+
+
+def regrade_scores(details, chunk_size=REGRADE_CHUNK_SIZE):
+    """
+    Regrade the scores of one assessment against its current passing score.
+
+    Only rows whose pass state changes are written, in short chunked
+    transactions so the score table is never locked for long. Returns the
+    number of scores that changed state.
+
+    The regrade mark of the assessment is cleared at the end, unless a
+    newer change marked it again while the regrade ran.
+    """
+    requested = Assessment.objects.filter(pk=details.assessment_id).values_list("regrade_requested_at", flat=True).first()
+    scores = AssessmentScore.objects.filter(assessment_id=details.assessment_id)
+    passing = details.passing_filter()
+
+    passed, passed_users = _regrade_rows(scores.filter(passing, is_passing=False), True, chunk_size)
+    failed, failed_users = _regrade_rows(scores.filter(is_passing=True).exclude(passing), False, chunk_size)
+
+    for user_id in passed_users | failed_users:
+        invalidate_user_reports(user_id)
+    if requested is not None:
+        Assessment.objects.filter(
+            pk=details.assessment_id,
+            regrade_requested_at=requested
+        ).update(regrade_requested_at=None)
+    return passed + failed
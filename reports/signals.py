@@ -0,0 +1,139 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    Assessment,
+    AssessmentScore,
+    AssessmentScoreDistribution,
+    Drill,
+    Report,
+    QualitativeAssessment,
+    QualitativeAssessmentChoices,
+    QuantitativeAssessment,
+    ReportTemplate,
+    TemplateAssessmentRelationship,
+)
+from .cache import invalidate_reports, invalidate_template_forms, invalidate_user_reports
+from .services import invalidate_snapshots, regrade_scores, request_regrade
+
+
+@receiver(post_save, sender=AssessmentScore)
+@receiver(post_delete, sender=AssessmentScore)
+def invalidate_score_report(sender, instance, **kwargs):
+    """
+    A changed score only affects the report it belongs to.
+    """
+    invalidate_snapshots(Report.objects.filter(pk=instance.report_id))
+    invalidate_user_reports(instance.user_id)
+
+
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Report)
+def invalidate_user_report_dates(sender, instance, **kwargs):
+    invalidate_user_reports(instance.user_id)
+
+
+@receiver(post_save, sender=Assessment)
+def invalidate_assessment_reports(sender, instance, created, **kwargs):
+    """
+    Names, descriptions and units are copied into every report of the assessment.
+    """
+    if not created:
+        invalidate_snapshots(Report.objects.filter(assessments=instance))
+        invalidate_reports()
+
+
+@receiver(post_save, sender=QuantitativeAssessment)
+@receiver(post_save, sender=QualitativeAssessment)
+@receiver(post_save, sender=QualitativeAssessmentChoices)
+def invalidate_assessment_detail_reports(sender, instance, created, **kwargs):
+    """
+    Passing scores and choice names are copied into every report of the assessment.
+    """
+    if not created:
+        invalidate_snapshots(Report.objects.filter(assessments=instance.assessment_id))
+        invalidate_reports()
+
+
+@receiver(pre_save, sender=QuantitativeAssessment)
+@receiver(pre_save, sender=QualitativeAssessment)
+def check_passing_score_change(sender, instance, **kwargs):
+    old = sender.objects.filter(pk=instance.pk).first() if instance.pk else None
+    instance._passing_score_changed = old is not None and old.passing_filter() != instance.passing_filter()
+
+
+@receiver(post_save, sender=QuantitativeAssessment)
+@receiver(post_save, sender=QualitativeAssessment)
+def regrade_after_commit(sender, instance, created, **kwargs):
+    """
+    Scores store their pass state, so they are regraded once the new
+    passing score is committed.
+
+    The regrade runs inline in the request that saved the passing score,
+    after its transaction commits. The assessment is marked in the same
+    transaction as the passing score and unmarked when the regrade
+    finishes, so a regrade cut short, for example by a worker timeout, is
+    finished by the regrade_scores command.
+    """
+    if getattr(instance, "_passing_score_changed", False):
+        request_regrade(instance)
+        transaction.on_commit(partial(regrade_scores, instance))
+
+
+@receiver(post_save, sender=Drill)
+@receiver(pre_delete, sender=Drill)
+def invalidate_drill_reports(sender, instance, **kwargs):
+    """
+    Runs before deletes, while the drill is still linked to its assessments.
+    """
+    invalidate_snapshots(Report.objects.filter(assessments__drills=instance))
+    invalidate_reports()
+
+
+@receiver(m2m_changed, sender=Drill.assessments.through)
+def invalidate_drill_assessment_reports(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Adding or removing a drill from an assessment changes the drills of its reports.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        # instance is an assessment
+        invalidate_snapshots(Report.objects.filter(assessments=instance))
+    elif action == "pre_clear":
+        invalidate_snapshots(Report.objects.filter(assessments__drills=instance))
+    else:
+        invalidate_snapshots(Report.objects.filter(assessments__in=pk_set))
+    invalidate_reports()
+
+
+@receiver(post_save, sender=AssessmentScore)
+@receiver(post_delete, sender=AssessmentScore)
+def update_score_distribution(sender, instance, created=False, **kwargs):
+    if instance.is_quantitative:
+        AssessmentScoreDistribution.row_saved(instance, created)
+
+
+@receiver(post_delete, sender=ReportTemplate)
+def invalidate_template_reports(sender, **kwargs):
+    invalidate_reports()
+
+
+@receiver(post_save, sender=ReportTemplate)
+@receiver(post_delete, sender=ReportTemplate)
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+@receiver(post_save, sender=QualitativeAssessmentChoices)
+@receiver(post_delete, sender=QualitativeAssessmentChoices)
+@receiver(post_save, sender=TemplateAssessmentRelationship)
+@receiver(post_delete, sender=TemplateAssessmentRelationship)
+def invalidate_template_form_cache(sender, **kwargs):
+    invalidate_template_forms()
+
+
+@receiver(m2m_changed, sender=ReportTemplate.assessments.through)
+def invalidate_template_form_cache_on_assessments_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_template_forms()
@@ -0,0 +1,201 @@
+import csv
+import datetime
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from reports.imports import ReportImporter
+from reports.models import (
+    Assessment,
+    AssessmentScore,
+    Report,
+    ReportTemplate,
+    QualitativeAssessment,
+    QualitativeAssessmentChoices,
+    QuantitativeAssessment,
+)
+from reports.tests.test_views import create_report
+
+
+class ExportScoresCommandTest(TestCase):
+
+    def setUp(self):
+        self.athlete = get_user_model().objects.create(email="athlete@example.com")
+        self.template = ReportTemplate.objects.create(name="Combine")
+        create_report(self.athlete, self.template, datetime.date(2023, 11, 1), 3)
+
+    def test_exports_csv_to_stdout(self):
+        out = StringIO()
+        call_command("export_scores", "--template", str(self.template.pk), stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("report_id,"))
+
+    def test_exports_ndjson_in_small_chunks(self):
+        out = StringIO()
+        call_command("export_scores", "--format", "ndjson", "--chunk-size", "1", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+
+class RegradeScoresCommandTest(TestCase):
+
+    def setUp(self):
+        self.athlete = get_user_model().objects.create(email="athlete@example.com")
+        self.template = ReportTemplate.objects.create(name="Combine")
+        create_report(self.athlete, self.template, datetime.date(2023, 11, 1), 6)
+        self.details = QuantitativeAssessment.objects.get(assessment__name="Quant 4")
+
+    def test_finishes_a_regrade_that_did_not_run(self):
+        # TestCase never commits, so the regrade after commit does not run, as if the request timed out
+        self.details.passing_score = Decimal("3")
+        self.details.save()
+        self.assertIsNotNone(Assessment.objects.get(name="Quant 4").regrade_requested_at)
+        self.assertFalse(AssessmentScore.objects.get(assessment__name="Quant 4").is_passing)
+
+        out = StringIO()
+        call_command("regrade_scores", stdout=out)
+        self.assertTrue(AssessmentScore.objects.get(assessment__name="Quant 4").is_passing)
+        self.assertFalse(Assessment.objects.filter(regrade_requested_at__isnull=False).exists())
+        self.assertIn("Quant 4: 1 scores changed state", out.getvalue())
+        self.assertIn("Regraded 1 assessments", out.getvalue())
+
+    def test_finished_regrade_clears_the_mark(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.details.passing_score = Decimal("3")
+            self.details.save()
+        self.assertFalse(Assessment.objects.filter(regrade_requested_at__isnull=False).exists())
+        out = StringIO()
+        call_command("regrade_scores", stdout=out)
+        self.assertIn("Regraded 0 assessments", out.getvalue())
+
+
+class ImportReportsCommandTest(TestCase):
+
+    def setUp(self):
+        self.athlete = get_user_model().objects.create(email="athlete@example.com")
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.quant = Assessment.objects.create(name="Broad Jump", assessment_type="quantitative")
+        QuantitativeAssessment.objects.create(
+            assessment=self.quant,
+            passing_score=Decimal("100"),
+            passing_condition="gte"
+        )
+        self.qual = Assessment.objects.create(name="Posture", assessment_type="qualitative")
+        good = QualitativeAssessmentChoices.objects.create(assessment=self.qual, choice="good")
+        QualitativeAssessment.objects.create(assessment=self.qual, passing_score=good)
+        self.template.assessments.set([self.quant, self.qual])
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_csv(self, rows):
+        path = os.path.join(self.directory.name, "scores.csv")
+        with open(path, "w", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(["email", "template", "date", "assessment", "value", "did_not_test"])
+            writer.writerows(rows)
+        return path
+
+    def test_imports_rows_into_reports(self):
+        path = self.write_csv([
+            ["Athlete@example.com", "Combine", "2020-01-01", "Broad Jump", "101.5", ""],
+            ["athlete@example.com", "Combine", "2020-01-01", "Posture", "good", ""],
+            ["athlete@example.com", "Combine", "2020-02-01", "Broad Jump", "99", "yes"],
+        ])
+        out = StringIO()
+        call_command("import_reports", path, "--batch-size", "2", stdout=out)
+
+        reports = Report.objects.order_by("creation_date")
+        self.assertEqual(reports.count(), 2)
+        self.assertEqual(reports[0].assessments.count(), 2)
+        self.assertEqual(AssessmentScore.objects.get(report=reports[0], assessment=self.quant).value, Decimal("101.5"))
+        self.assertTrue(AssessmentScore.objects.get(report=reports[1]).did_not_test)
+        self.assertIn("Imported 3 scores, skipped 0 invalid rows", out.getvalue())
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        path = self.write_csv([
+            ["nobody@example.com", "Combine", "2020-01-01", "Broad Jump", "101", ""],
+            ["athlete@example.com", "Combine", "2020-01-01", "Posture", "great", ""],
+            ["athlete@example.com", "Combine", "01/01/2020", "Broad Jump", "101", ""],
+            ["athlete@example.com", "Combine", "2020-01-01", "Broad Jump", "1000", ""],
+            ["athlete@example.com", "Combine", "2020-01-01", "Broad Jump", "101", ""],
+        ])
+        out, err = StringIO(), StringIO()
+        call_command("import_reports", path, stdout=out, stderr=err)
+        self.assertEqual(AssessmentScore.objects.count(), 1)
+        self.assertEqual(len(err.getvalue().splitlines()), 4)
+        self.assertIn("Row 2: Unknown choice great", err.getvalue())
+
+    def test_malformed_jsonl_lines_are_reported_and_skipped(self):
+        path = os.path.join(self.directory.name, "scores.jsonl")
+        with open(path, "w") as output:
+            output.write('{"email": "athlete@example.com", "template": "Combine", "date": "2020-01-01", "assessment": "Broad Jump", "value": 101}\n')
+            output.write('{"email": "athlete@example.com", "template"\n')
+            output.write('["athlete@example.com", "Combine"]\n')
+            output.write('{"email": "athlete@example.com", "template": "Combine", "date": "2020-01-02", "assessment": "Broad Jump", "value": "99"}\n')
+        out, err = StringIO(), StringIO()
+        call_command("import_reports", path, "--batch-size", "2", stdout=out, stderr=err)
+
+        self.assertEqual(AssessmentScore.objects.count(), 2)
+        self.assertIn("Row 2: Invalid JSON", err.getvalue())
+        self.assertIn("Row 3: Row is not an object", err.getvalue())
+        self.assertIn("Imported 2 scores, skipped 2 invalid rows", out.getvalue())
+        self.assertEqual(ReportImporter(os.path.abspath(path)).checkpoint(), 4)
+
+    def test_resumes_after_last_committed_batch(self):
+        rows = [
+            {"email": "athlete@example.com", "template": "Combine", "date": f"2020-01-0{day}", "assessment": "Broad Jump", "value": "100"}
+            for day in range(1, 6)
+        ]
+
+        def failing_rows():
+            yield from rows[:3]
+            raise OSError("connection lost")
+
+        importer = ReportImporter("scores.jsonl", batch_size=2)
+        with self.assertRaises(OSError):
+            importer.import_rows(failing_rows())
+        self.assertEqual(Report.objects.count(), 2)
+        self.assertEqual(importer.checkpoint(), 2)
+
+        imported, skipped = ReportImporter("scores.jsonl", batch_size=2).import_rows(iter(rows))
+        self.assertEqual(imported, 3)
+        self.assertEqual(Report.objects.count(), 5)
+        self.assertEqual(AssessmentScore.objects.count(), 5)
+
+    def test_rows_for_an_existing_report_are_added_to_it(self):
+        report = Report.objects.create(user=self.athlete, template=self.template, creation_date=datetime.date(2020, 1, 1))
+        path = self.write_csv([["athlete@example.com", "Combine", "2020-01-01", "Broad Jump", "101", ""]])
+        call_command("import_reports", path, stdout=StringIO())
+        self.assertEqual(Report.objects.get(), report)
+        self.assertEqual(report.assessments.get(), self.quant)
+
+    def test_scores_a_report_already_has_are_skipped(self):
+        report = Report.objects.create(user=self.athlete, template=self.template, creation_date=datetime.date(2020, 1, 1))
+        AssessmentScore.objects.create(assessment=self.quant, user=self.athlete, report=report, value=Decimal("99"))
+        path = self.write_csv([
+            ["athlete@example.com", "Combine", "2020-01-01", "Broad Jump", "101", ""],
+            ["athlete@example.com", "Combine", "2020-01-02", "Broad Jump", "101", ""],
+            ["athlete@example.com", "Combine", "2020-01-02", "Broad Jump", "102", ""],
+        ])
+        out, err = StringIO(), StringIO()
+        call_command("import_reports", path, stdout=out, stderr=err)
+        self.assertEqual(AssessmentScore.objects.get(report=report).value, Decimal("99"))
+        self.assertIn("Row 1: Report already has a score for Broad Jump", err.getvalue())
+        self.assertIn("Row 3: Report already has a score for Broad Jump", err.getvalue())
+        self.assertIn("Imported 1 scores, skipped 2 invalid rows", out.getvalue())
+
+        call_command("import_reports", path, "--restart", stdout=out, stderr=StringIO())
+        self.assertEqual(AssessmentScore.objects.count(), 2)
+        self.assertIn("Imported 0 scores, skipped 3 invalid rows", out.getvalue())
+
+    def test_extra_decimal_places_are_rounded(self):
+        path = self.write_csv([["athlete@example.com", "Combine", "2020-01-01", "Broad Jump", "99.999", ""]])
+        call_command("import_reports", path, stdout=StringIO())
+        score = AssessmentScore.objects.get()
+        self.assertEqual(score.value, Decimal("100.00"))
+        self.assertTrue(score.is_passing)
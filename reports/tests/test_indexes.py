@@ -0,0 +1,93 @@
+import datetime
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from reports.models import (
+    Assessment,
+    AssessmentScore,
+    Report,
+    ReportTemplate,
+    QualitativeAssessment,
+    QualitativeAssessmentChoices,
+    QuantitativeAssessment,
+)
+
+
+class HotQueryIndexTest(TestCase):
+    """Fail if one of the hot report lookups stops being served by its index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            get_user_model().objects.create(email=f"athlete{i}@example.com", first_name="Test", last_name=str(i))
+            for i in range(5)
+        ]
+        cls.templates = [ReportTemplate.objects.create(name=f"Template {i}") for i in range(3)]
+
+        cls.quant = Assessment.objects.create(name="Broad Jump", assessment_type="quantitative")
+        QuantitativeAssessment.objects.create(
+            assessment=cls.quant,
+            passing_score=Decimal("100"),
+            passing_condition="gte"
+        )
+        cls.qual = Assessment.objects.create(name="Posture", assessment_type="qualitative")
+        choice = QualitativeAssessmentChoices.objects.create(assessment=cls.qual, choice="good")
+        QualitativeAssessment.objects.create(assessment=cls.qual, passing_score=choice)
+
+        reports = Report.objects.bulk_create([
+            Report(user=user, template=template, creation_date=datetime.date(2023, 1, 1) + datetime.timedelta(days=day))
+            for user in cls.users
+            for template in cls.templates
+            for day in range(20)
+        ])
+        AssessmentScore.objects.bulk_create([
+            AssessmentScore(
+                assessment=cls.quant,
+                user_id=report.user_id,
+                report=report,
+                value=Decimal("101")
+            )
+            for report in reports
+        ] + [
+            AssessmentScore(
+                assessment=cls.qual,
+                user_id=report.user_id,
+                report=report,
+                choice=choice
+            )
+            for report in reports
+        ])
+        cls.report = reports[0]
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index_name):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # The seeded tables are small enough that postgres would
+                # rather scan them, so only let it choose between indexes.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_report_lookup_uses_index(self):
+        queryset = Report.objects.filter(
+            user=self.users[0],
+            template=self.templates[0],
+            creation_date=datetime.date(2023, 1, 5)
+        )
+        self.assertUsesIndex(queryset, "report_user_template_date_idx")
+
+    def test_report_dates_use_index(self):
+        queryset = Report.objects.filter(
+            template=self.templates[1],
+            user=self.users[2]
+        ).values("creation_date").distinct().order_by("-creation_date")
+        self.assertUsesIndex(queryset, "report_user_template_date_idx")
+
+    def test_score_lookup_uses_index(self):
+        queryset = AssessmentScore.objects.filter(report=self.report, assessment=self.quant)
+        self.assertUsesIndex(queryset, "score_report_assessment_idx")
@@ -11,11 +11,12 @@ from reports.models import (
     Assessment,
     QualitativeAssessment,
     QuantitativeAssessment,
-    QualitativeAssessmentScore,
-    QuantitativeAssessmentScore,
+    AssessmentScore,
     QualitativeAssessmentChoices,
-    Drill
+    Drill,
+    AssessmentScoreDistribution
 )
+from reports.services import regrade_scores
 
 # Set the precision for Decimal instances
 getcontext().prec = 5
@@ -190,9 +191,6 @@ class ReportCreationTest(TestCase):
             template=self.report_template,
         )
 
-        self.report_one.assessments.set(
-            self.report_template.assessments.all()
-        )
 
     def test_valid_user(self):
         report = Report.objects.create(
@@ -418,64 +416,54 @@ class QuantitativeAssessmentScoreCreationTest(TestCase):
             user=self.user,
             template=self.report_template,
         )
-        self.report.assessments.set(
-            self.report_template.assessments.all()
-        )
-        self.quant_score_one = QuantitativeAssessmentScore(
+        self.quant_score_one = AssessmentScore(
             assessment=self.assessment_one,
-            quantitative_assessment = self.quantitative_assessment_one,
             user=self.user,
             report=self.report,
-            score=Decimal(117.52)
+            value=Decimal(117.52)
         )
-        self.quant_score_two = QuantitativeAssessmentScore(
+        self.quant_score_two = AssessmentScore(
             assessment=self.assessment_two,
-            quantitative_assessment = self.quantitative_assessment_two,
             user=self.user,
             report=self.report,
-            score=Decimal(1.85)
+            value=Decimal(1.85)
         )
-        self.quant_score_three = QuantitativeAssessmentScore(
+        self.quant_score_three = AssessmentScore(
             assessment=self.assessment_three,
-            quantitative_assessment = self.quantitative_assessment_three,
             user=self.user,
             report=self.report,
-            score=Decimal(315)
+            value=Decimal(315)
         )
-        self.quant_score_four = QuantitativeAssessmentScore(
+        self.quant_score_four = AssessmentScore(
             assessment=self.assessment_four,
-            quantitative_assessment = self.quantitative_assessment_four,
             user=self.user,
             report=self.report,
-            score=Decimal(1.00)
+            value=Decimal(1.00)
         )
-        self.quant_score_five = QuantitativeAssessmentScore(
+        self.quant_score_five = AssessmentScore(
             assessment=self.assessment_five,
-            quantitative_assessment = self.quantitative_assessment_five,
             user=self.user,
             report=self.report,
-            score=Decimal(0.5)
+            value=Decimal(0.5)
         )
 
     def test_valid_score(self):
         score = Decimal(1.53)
-        quant_score = QuantitativeAssessmentScore(
+        quant_score = AssessmentScore(
             assessment=self.assessment_two,
-            quantitative_assessment = self.quantitative_assessment_two,
             user=self.user,
             report=self.report,
-            score=score
+            value=score
         )
-        self.assertEqual(quant_score.score, score)
+        self.assertEqual(quant_score.value, score)
 
     def test_invalid_score(self):
         score = "Invalid Score"
-        quant_score = QuantitativeAssessmentScore(
+        quant_score = AssessmentScore(
             assessment=self.assessment_two,
-            quantitative_assessment = self.quantitative_assessment_two,
             user=self.user,
             report=self.report,
-            score=score
+            value=score
         )
         with self.assertRaises(ValidationError):
             quant_score.full_clean()
@@ -486,6 +474,55 @@ class QuantitativeAssessmentScoreCreationTest(TestCase):
         self.assertEqual(self.quant_score_three.passed(), False)
         self.assertEqual(self.quant_score_four.passed(), True)
         self.assertEqual(self.quant_score_five.passed(), True)
+
+    def test_stored_pass_state_matches_passed_method(self):
+        scores = [
+            self.quant_score_one,
+            self.quant_score_two,
+            self.quant_score_three,
+            self.quant_score_four,
+            self.quant_score_five,
+        ]
+        for score in scores:
+            score.save()
+        graded = dict(AssessmentScore.objects.values_list("pk", "is_passing"))
+        for score in scores:
+            score.refresh_from_db()
+            self.assertEqual(graded[score.pk], score.passed())
+
+    def test_passing_score_change_regrades_only_changed_scores(self):
+        for score in [self.quant_score_one, self.quant_score_two, self.quant_score_three]:
+            score.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.quantitative_assessment_one.passing_score = Decimal("120")
+            self.quantitative_assessment_one.save()
+            self.quantitative_assessment_three.passing_condition = "lt"
+            self.quantitative_assessment_three.save()
+        graded = dict(AssessmentScore.objects.values_list("pk", "is_passing"))
+        self.assertEqual(graded, {
+            self.quant_score_one.pk: False,
+            self.quant_score_two.pk: False,
+            self.quant_score_three.pk: True,
+        })
+
+    def test_regrade_works_in_chunks(self):
+        for score in range(10):
+            AssessmentScore.objects.create(
+                assessment=self.assessment_one,
+                user=self.user,
+                report=self.report,
+                value=Decimal(110 + score)
+            )
+        self.quantitative_assessment_one.passing_score = Decimal("112")
+        self.assertEqual(regrade_scores(self.quantitative_assessment_one, chunk_size=3), 3)
+        self.assertEqual(AssessmentScore.objects.passing().count(), 8)
+        self.assertEqual(regrade_scores(self.quantitative_assessment_one, chunk_size=3), 0)
+
+    def test_passing_and_failing_filters(self):
+        for score in [self.quant_score_one, self.quant_score_two, self.quant_score_three]:
+            score.save()
+        self.assertEqual(list(AssessmentScore.objects.passing()), [self.quant_score_one])
+        self.assertEqual(AssessmentScore.objects.failing().count(), 2)
     
     def test_str_method(self):
         exp_str = "Jane Doe's score for Broad Jump assessment for report Physical Report"
@@ -654,7 +691,6 @@ class QualitativeAssessmentScoreCreationTest(TestCase):
             user=self.user,
             template=self.template,
         )
-        self.report.assessments.set(self.template.assessments.all())
         self.choice_one = QualitativeAssessmentChoices.objects.create(
             assessment=self.assessment,
             choice="bitter"
@@ -671,47 +707,54 @@ class QualitativeAssessmentScoreCreationTest(TestCase):
             assessment=self.assessment,
             passing_score=self.choice_three
         )
-        self.qual_score = QualitativeAssessmentScore.objects.create(
+        self.qual_score = AssessmentScore.objects.create(
             assessment=self.assessment,
-            qualitative_assessment=self.qual_assessment,
             user=self.user,
             report=self.report,
-            score=self.choice_three
+            choice=self.choice_three
         )
-        self.qual_score_two = QualitativeAssessmentScore.objects.create(
+        self.qual_score_two = AssessmentScore.objects.create(
             assessment=self.assessment,
-            qualitative_assessment=self.qual_assessment,
             user=self.user,
             report=self.report,
-            score=self.choice_one
+            choice=self.choice_one
         )
     
     def test_valid_score(self):
         score = self.choice_one
-        qual_score = QualitativeAssessmentScore.objects.create(
+        qual_score = AssessmentScore.objects.create(
             assessment=self.assessment,
-            qualitative_assessment=self.qual_assessment,
             user=self.user,
             report=self.report,
-            score=score
+            choice=score
         )
         qual_score.full_clean()
-        self.assertEqual(qual_score.score, score)
+        self.assertEqual(qual_score.choice, score)
     
     def test_invalid_score(self):
         score="Invalid Score"
         with self.assertRaises(ValueError):
-            qual_score = QualitativeAssessmentScore.objects.create(
+            qual_score = AssessmentScore.objects.create(
             assessment=self.assessment,
-            qualitative_assessment=self.qual_assessment,
             user=self.user,
             report=self.report,
-            score=score
+            choice=score
         )
     
     def test_passed_method(self):
         self.assertEqual(self.qual_score.passed(), True)
         self.assertEqual(self.qual_score_two.passed(), False)
+
+    def test_stored_pass_state(self):
+        graded = dict(AssessmentScore.objects.values_list("pk", "is_passing"))
+        self.assertEqual(graded, {self.qual_score.pk: True, self.qual_score_two.pk: False})
+        self.assertEqual(list(AssessmentScore.objects.failing()), [self.qual_score_two])
+
+    def test_passing_choice_change_regrades_scores(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.qual_assessment.passing_score = self.choice_one
+            self.qual_assessment.save()
+        self.assertEqual(list(AssessmentScore.objects.passing()), [self.qual_score_two])
     
     def test_str_method(self):
         exp_str = "Jane Doe's score for Taste for report Food"
@@ -789,3 +832,45 @@ class DrillCreationTest(TestCase):
     def test_str_method(self):
         exp_str = "Drill One is recommended drill"
         self.assertEqual(str(self.drill_one), exp_str)
+
+
+class AssessmentScoreDistributionTest(TestCase):
+
+    def setUp(self):
+        self.assessment = Assessment.objects.create(
+            name="Broad Jump",
+            assessment_type="quantitative",
+            unit="inches"
+        )
+        self.distribution = AssessmentScoreDistribution(assessment=self.assessment, stale=False)
+        self.distribution.add([3.0, 1.0, 2.0, 2.0, 4.0])
+
+    def test_add_keeps_distinct_values_sorted(self):
+        self.assertEqual(self.distribution.values, [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(self.distribution.cumulative_counts, [1, 3, 4, 5])
+        self.distribution.add([2.5])
+        self.assertEqual(self.distribution.values, [1.0, 2.0, 2.5, 3.0, 4.0])
+        self.assertEqual(self.distribution.cumulative_counts, [1, 3, 4, 5, 6])
+
+    def test_percentile(self):
+        self.assertEqual(self.distribution.percentile(0.5), 0)
+        self.assertEqual(self.distribution.percentile(2.0), 40)
+        self.assertEqual(self.distribution.percentile(5.0), 100)
+
+    def test_quantile(self):
+        self.assertEqual(self.distribution.quantile(0), 1.0)
+        self.assertEqual(self.distribution.quantile(0.5), 2.0)
+        self.assertEqual(self.distribution.quantile(0.875), 3.5)
+        self.assertEqual(self.distribution.quantile(1), 4.0)
+
+    def test_histogram(self):
+        histogram = self.distribution.histogram(3)
+        self.assertEqual(histogram["edges"], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(histogram["counts"], [1, 2, 2])
+
+    def test_empty_distribution(self):
+        distribution = AssessmentScoreDistribution(assessment=self.assessment)
+        self.assertEqual(distribution.count, 0)
+        self.assertIsNone(distribution.percentile(1.0))
+        self.assertIsNone(distribution.quantile(0.5))
+
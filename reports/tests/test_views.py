@@ -0,0 +1,1065 @@
+import datetime
+import json
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from reports.models import (
+    Assessment,
+    AssessmentScore,
+    AssessmentScoreDistribution,
+    Drill,
+    Report,
+    ReportTemplate,
+    QualitativeAssessment,
+    QualitativeAssessmentChoices,
+    QuantitativeAssessment,
+    TemplateAssessmentRelationship,
+)
+
+
+def create_report(user, template, creation_date, num_assessments):
+    """Create a report with half quantitative and half qualitative scored assessments."""
+    report = Report.objects.create(user=user, template=template, creation_date=creation_date)
+
+    for i in range(num_assessments):
+        if i % 2 == 0:
+            assessment = Assessment.objects.create(
+                name=f"Quant {i}",
+                assessment_type="quantitative",
+                unit="inches"
+            )
+            details = QuantitativeAssessment.objects.create(
+                assessment=assessment,
+                passing_score=Decimal("10"),
+                passing_condition="gte"
+            )
+            AssessmentScore.objects.create(
+                assessment=assessment,
+                user=user,
+                report=report,
+                value=Decimal(i)
+            )
+        else:
+            assessment = Assessment.objects.create(
+                name=f"Qual {i}",
+                assessment_type="qualitative"
+            )
+            good = QualitativeAssessmentChoices.objects.create(assessment=assessment, choice="good")
+            bad = QualitativeAssessmentChoices.objects.create(assessment=assessment, choice="bad")
+            details = QualitativeAssessment.objects.create(assessment=assessment, passing_score=good)
+            AssessmentScore.objects.create(
+                assessment=assessment,
+                user=user,
+                report=report,
+                choice=good if i % 3 == 0 else bad
+            )
+
+        drill = Drill.objects.create(name=f"Drill {i}", url="https://example.com/drill")
+        drill.assessments.add(assessment)
+        template.assessments.add(assessment)
+
+    return report
+
+
+class UserReportTest(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            first_name="Jane",
+            last_name="Doe"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.trainer_client = APIClient()
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.trainer_client.force_authenticate(user=self.trainer)
+
+        self.small_template = ReportTemplate.objects.create(name="Small")
+        self.large_template = ReportTemplate.objects.create(name="Large")
+        self.date = datetime.date(2023, 11, 1)
+        create_report(self.user, self.small_template, self.date, 2)
+        create_report(self.user, self.large_template, self.date, 12)
+
+    def test_user_report_returns_every_assessment(self):
+        url = reverse("user-report", args=[self.large_template.pk, "2023-11-01"])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 12)
+
+        quant = next(item for item in response.data if item["name"] == "Quant 10")
+        self.assertEqual(quant["type"], "quantitative")
+        self.assertEqual(quant["passing_score"], Decimal("10"))
+        self.assertEqual(quant["score"], Decimal("10"))
+        self.assertTrue(quant["passed"])
+        self.assertEqual(quant["drills"], [{"name": "Drill 10", "drill_url": "https://example.com/drill"}])
+
+        qual = next(item for item in response.data if item["name"] == "Qual 1")
+        self.assertEqual(qual["passing_score"], "good")
+        self.assertEqual(qual["score"], "bad")
+        self.assertFalse(qual["passed"])
+
+    def test_assessments_are_in_the_order_their_scores_were_saved(self):
+        score = AssessmentScore.objects.get(report__template=self.small_template, assessment__name="Quant 0")
+        score.delete()
+        score.pk = None
+        score.save()
+
+        url = reverse("user-report", args=[self.small_template.pk, "2023-11-01"])
+        response = self.client.get(url)
+        self.assertEqual([item["name"] for item in response.data], ["Qual 1", "Quant 0"])
+
+    def test_user_report_query_count_does_not_grow_with_assessments(self):
+        small_url = reverse("user-report", args=[self.small_template.pk, "2023-11-01"])
+        large_url = reverse("user-report", args=[self.large_template.pk, "2023-11-01"])
+        # the first read renders and stores the snapshot
+        with self.assertNumQueries(5):
+            self.client.get(small_url)
+        with self.assertNumQueries(5):
+            self.client.get(large_url)
+
+    def test_user_report_is_served_from_snapshot(self):
+        url = reverse("user-report", args=[self.large_template.pk, "2023-11-01"])
+        rendered = self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.json(), rendered.json())
+
+    def test_trainer_report_matches_user_report(self):
+        user_url = reverse("user-report", args=[self.large_template.pk, "2023-11-01"])
+        trainer_url = reverse("trainer-user-report", args=[self.user.pk, self.large_template.pk, "2023-11-01"])
+        with self.assertNumQueries(5):
+            response = self.trainer_client.get(trainer_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), self.client.get(user_url).json())
+
+    def test_drill_change_rebuilds_snapshot(self):
+        url = reverse("user-report", args=[self.large_template.pk, "2023-11-01"])
+        self.client.get(url)
+        drill = Drill.objects.get(name="Drill 10")
+        drill.name = "Renamed Drill"
+        drill.save()
+
+        quant = next(item for item in self.client.get(url).data if item["name"] == "Quant 10")
+        self.assertEqual(quant["drills"], [{"name": "Renamed Drill", "drill_url": "https://example.com/drill"}])
+
+    def test_score_change_rebuilds_snapshot(self):
+        url = reverse("user-report", args=[self.large_template.pk, "2023-11-01"])
+        self.client.get(url)
+        score = AssessmentScore.objects.get(assessment__name="Quant 10", report__template=self.large_template)
+        score.value = Decimal("2")
+        score.save()
+
+        quant = next(item for item in self.client.get(url).data if item["name"] == "Quant 10")
+        self.assertEqual(quant["score"], Decimal("2"))
+        self.assertFalse(quant["passed"])
+
+    def test_missing_report_returns_not_found(self):
+        url = reverse("user-report", args=[self.large_template.pk, "2020-01-01"])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class HandleReportFormTest(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.trainer)
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.assessments = []
+        for i in range(10):
+            if i % 2 == 0:
+                assessment = Assessment.objects.create(name=f"Quant {i}", assessment_type="quantitative")
+                QuantitativeAssessment.objects.create(
+                    assessment=assessment,
+                    passing_score=Decimal("10"),
+                    passing_condition="gte"
+                )
+            else:
+                assessment = Assessment.objects.create(name=f"Qual {i}", assessment_type="qualitative")
+                good = QualitativeAssessmentChoices.objects.create(assessment=assessment, choice="good")
+                QualitativeAssessmentChoices.objects.create(assessment=assessment, choice="bad")
+                QualitativeAssessment.objects.create(assessment=assessment, passing_score=good)
+            self.template.assessments.add(assessment)
+            self.assessments.append(assessment)
+
+    def payload(self, assessments):
+        data = {
+            "userId": self.athlete.pk,
+            "templateId": self.template.pk,
+            "date": "2023-11-01",
+            "didNotTest": [assessments[0].pk],
+            "assessments": {
+                assessment.name: {
+                    "id": assessment.pk,
+                    "type": assessment.assessment_type,
+                    "value": "12.5" if assessment.assessment_type == "quantitative" else "bad",
+                }
+                for assessment in assessments
+            },
+        }
+        return data
+
+    def test_creates_report_with_scores(self):
+        response = self.client.post("/api/reports/build-report/", self.payload(self.assessments), format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        report = Report.objects.get(user=self.athlete, template=self.template)
+        self.assertEqual(report.assessments.count(), 10)
+        self.assertEqual(AssessmentScore.objects.filter(report=report, value=Decimal("12.5")).count(), 5)
+        self.assertEqual(AssessmentScore.objects.filter(report=report, choice__choice="bad").count(), 5)
+        self.assertTrue(AssessmentScore.objects.get(report=report, assessment=self.assessments[0]).did_not_test)
+        self.assertEqual(len(report.snapshot), 10)
+
+    def test_query_count_does_not_grow_with_assessments(self):
+        with self.assertNumQueries(16):
+            self.client.post("/api/reports/build-report/", self.payload(self.assessments[:4]), format="json")
+        with self.assertNumQueries(16):
+            self.client.post("/api/reports/build-report/", self.payload(self.assessments), format="json")
+
+    def test_unknown_choice_creates_nothing(self):
+        data = self.payload(self.assessments)
+        data["assessments"]["Qual 1"]["value"] = "unknown"
+        response = self.client.post("/api/reports/build-report/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Report.objects.exists())
+
+    def test_unknown_assessment_returns_bad_request(self):
+        data = self.payload(self.assessments)
+        data["assessments"]["Quant 0"]["id"] = 0
+        response = self.client.post("/api/reports/build-report/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Assessment does not exists"})
+
+    def test_missing_assessment_id_returns_bad_request(self):
+        data = self.payload(self.assessments)
+        data["assessments"]["Quant 0"]["id"] = None
+        response = self.client.post("/api/reports/build-report/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Assessment does not exists"})
+
+    def test_out_of_range_score_creates_nothing(self):
+        data = self.payload(self.assessments)
+        data["assessments"]["Quant 2"]["value"] = "1000"
+        response = self.client.post("/api/reports/build-report/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Invalid score 1000 for Quant 2"})
+        self.assertFalse(Report.objects.exists())
+
+    def test_extra_decimal_places_are_rounded(self):
+        data = self.payload(self.assessments)
+        data["assessments"]["Quant 2"]["value"] = "9.999"
+        response = self.client.post("/api/reports/build-report/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        score = AssessmentScore.objects.get(assessment=self.assessments[2])
+        self.assertEqual(score.value, Decimal("10.00"))
+        self.assertTrue(score.is_passing)
+
+
+class HandleTeamReportFormTest(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.trainer)
+        self.athletes = [
+            get_user_model().objects.create_user(email=f"athlete{i}@example.com", password="kjhdfJHJHjhflnkjwh876!")
+            for i in range(6)
+        ]
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.quant = Assessment.objects.create(name="Broad Jump", assessment_type="quantitative")
+        QuantitativeAssessment.objects.create(
+            assessment=self.quant,
+            passing_score=Decimal("100"),
+            passing_condition="gte"
+        )
+        self.qual = Assessment.objects.create(name="Posture", assessment_type="qualitative")
+        good = QualitativeAssessmentChoices.objects.create(assessment=self.qual, choice="good")
+        QualitativeAssessment.objects.create(assessment=self.qual, passing_score=good)
+        self.template.assessments.set([self.quant, self.qual])
+        self.url = reverse("build-team-report")
+
+    def athlete_payload(self, athlete, score="101.5", choice="good"):
+        return {
+            "userId": athlete.pk,
+            "didNotTest": [],
+            "assessments": {
+                "Broad Jump": {"id": self.quant.pk, "type": "quantitative", "value": score},
+                "Posture": {"id": self.qual.pk, "type": "qualitative", "value": choice},
+            },
+        }
+
+    def payload(self, athletes):
+        return {"templateId": self.template.pk, "date": "2023-11-01", "athletes": athletes}
+
+    def test_creates_a_report_per_athlete(self):
+        data = self.payload([self.athlete_payload(athlete) for athlete in self.athletes])
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [{"userId": athlete.pk, "created": True} for athlete in self.athletes])
+
+        self.assertEqual(Report.objects.filter(template=self.template).count(), 6)
+        for athlete in self.athletes:
+            report = Report.objects.get(user=athlete)
+            self.assertEqual(report.assessments.count(), 2)
+            self.assertEqual(AssessmentScore.objects.get(report=report, choice__isnull=True).value, Decimal("101.5"))
+
+    def test_invalid_athletes_get_errors_and_the_rest_are_created(self):
+        unknown_assessment = self.athlete_payload(self.athletes[3])
+        unknown_assessment["assessments"]["Broad Jump"]["id"] = 0
+        data = self.payload([
+            self.athlete_payload(self.athletes[0]),
+            self.athlete_payload(self.athletes[1], choice="great"),
+            self.athlete_payload(self.athletes[2], score="1000"),
+            unknown_assessment,
+            {"userId": 0, "assessments": {}},
+            {"assessments": {}},
+        ])
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [
+            {"userId": self.athletes[0].pk, "created": True},
+            {"userId": self.athletes[1].pk, "error": "Choice does not exists"},
+            {"userId": self.athletes[2].pk, "error": "Invalid score 1000 for Broad Jump"},
+            {"userId": self.athletes[3].pk, "error": "Assessment does not exists"},
+            {"userId": 0, "error": "User does not exists"},
+            {"userId": None, "error": "userId not provided"},
+        ])
+        self.assertEqual(list(Report.objects.values_list("user", flat=True)), [self.athletes[0].pk])
+
+    def test_athletes_without_scores_get_their_report_dates_refreshed(self):
+        athlete = self.athletes[0]
+        url = reverse("report-template-report-dates-user", args=[self.template.pk, athlete.pk])
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, self.payload([{"userId": athlete.pk, "assessments": {}}]), format="json")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+
+    def test_assessments_outside_the_template_are_rejected(self):
+        other = Assessment.objects.create(name="Other", assessment_type="quantitative")
+        QuantitativeAssessment.objects.create(assessment=other, passing_score=Decimal("1"), passing_condition="gte")
+        athlete = self.athlete_payload(self.athletes[0])
+        athlete["assessments"]["Other"] = {"id": other.pk, "type": "quantitative", "value": "1"}
+        response = self.client.post(self.url, self.payload([athlete]), format="json")
+        self.assertEqual(response.data["results"], [{"userId": self.athletes[0].pk, "error": "Assessment does not exists"}])
+
+    def test_query_count_does_not_grow_with_athletes(self):
+        with self.assertNumQueries(13):
+            self.client.post(self.url, self.payload([self.athlete_payload(self.athletes[0])]), format="json")
+        with self.assertNumQueries(13):
+            self.client.post(self.url, self.payload([self.athlete_payload(a) for a in self.athletes]), format="json")
+
+    def test_missing_template_returns_bad_request(self):
+        response = self.client.post(self.url, {"date": "2023-11-01", "athletes": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "templateId not provided"})
+
+
+class UserAssessmentTrendTest(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.trainer)
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.quant = Assessment.objects.create(name="Broad Jump", assessment_type="quantitative", unit="inches")
+        quant_details = QuantitativeAssessment.objects.create(
+            assessment=self.quant,
+            passing_score=Decimal("100"),
+            passing_condition="gte"
+        )
+        self.qual = Assessment.objects.create(name="Posture", assessment_type="qualitative")
+        good = QualitativeAssessmentChoices.objects.create(assessment=self.qual, choice="good")
+        bad = QualitativeAssessmentChoices.objects.create(assessment=self.qual, choice="bad")
+        qual_details = QualitativeAssessment.objects.create(assessment=self.qual, passing_score=good)
+
+        scores = [("2023-01-01", "90", False, bad), ("2023-01-11", "0", True, bad), ("2023-01-21", "110", False, good)]
+        for date, score, did_not_test, choice in scores:
+            report = Report.objects.create(user=self.athlete, template=self.template, creation_date=date)
+            AssessmentScore.objects.create(
+                assessment=self.quant,
+                user=self.athlete,
+                report=report,
+                value=Decimal(score),
+                did_not_test=did_not_test
+            )
+            AssessmentScore.objects.create(
+                assessment=self.qual,
+                user=self.athlete,
+                report=report,
+                choice=choice
+            )
+        self.url = reverse("user-trend", args=[self.athlete.pk, self.template.pk])
+
+    def test_returns_series_per_assessment(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"window": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        quant, qual = response.data
+
+        self.assertEqual(quant["name"], "Broad Jump")
+        self.assertEqual(quant["dates"], [datetime.date(2023, 1, 1), datetime.date(2023, 1, 11), datetime.date(2023, 1, 21)])
+        self.assertEqual(quant["passed"], [False, False, True])
+        # the untested score is left out of the numbers
+        self.assertEqual(quant["deltas"], [None, None, Decimal("20")])
+        self.assertEqual(quant["rolling_mean"], [Decimal("90"), None, Decimal("100")])
+        self.assertEqual(quant["slope"], Decimal("1"))
+
+        self.assertEqual(qual["scores"], ["bad", "bad", "good"])
+        self.assertEqual(qual["passed"], [False, False, True])
+        self.assertNotIn("slope", qual)
+
+    def test_invalid_window_returns_bad_request(self):
+        response = self.client.get(self.url, {"window": "0"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_athletes_only_read_their_own_trend(self):
+        other = get_user_model().objects.create_user(email="other@example.com", password="kjhdfJHJHjhflnkjwh876!")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.athlete)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+
+class ReportComparisonTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.trainer)
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.old = Report.objects.create(user=self.athlete, template=self.template, creation_date=datetime.date(2023, 1, 1))
+        self.new = Report.objects.create(user=self.athlete, template=self.template, creation_date=datetime.date(2023, 6, 1))
+
+        self.jump = self.quantitative("Broad Jump", [(self.old, "90", False), (self.new, "110.5", False)])
+        self.sprint = self.quantitative("Sprint", [(self.old, "100", False), (self.new, "0", True)])
+        self.posture = Assessment.objects.create(name="Posture", assessment_type="qualitative")
+        good = QualitativeAssessmentChoices.objects.create(assessment=self.posture, choice="good")
+        bad = QualitativeAssessmentChoices.objects.create(assessment=self.posture, choice="bad")
+        details = QualitativeAssessment.objects.create(assessment=self.posture, passing_score=good)
+        for report, choice in [(self.old, good), (self.new, bad)]:
+            AssessmentScore.objects.create(
+                assessment=self.posture,
+                user=self.athlete,
+                report=report,
+                choice=choice
+            )
+        self.vertical = self.quantitative("Vertical", [(self.new, "120", False)])
+
+    def quantitative(self, name, scores):
+        assessment = Assessment.objects.create(name=name, assessment_type="quantitative", unit="inches")
+        details = QuantitativeAssessment.objects.create(
+            assessment=assessment,
+            passing_score=Decimal("100"),
+            passing_condition="gte"
+        )
+        for report, score, did_not_test in scores:
+            AssessmentScore.objects.create(
+                assessment=assessment,
+                user=self.athlete,
+                report=report,
+                value=Decimal(score),
+                did_not_test=did_not_test
+            )
+        return assessment
+
+    def url(self, old_date="2023-01-01", new_date="2023-06-01"):
+        return reverse("report-diff", args=[self.athlete.pk, self.template.pk, old_date, new_date])
+
+    def test_compares_scores_per_assessment(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = {entry["name"]: entry for entry in json.loads(response.content)}
+
+        self.assertEqual(data["Broad Jump"]["old"], {"score": 90.0, "passed": False, "did_not_test": False})
+        self.assertEqual(data["Broad Jump"]["new"], {"score": 110.5, "passed": True, "did_not_test": False})
+        self.assertEqual(data["Broad Jump"]["delta"], 20.5)
+        self.assertEqual(data["Broad Jump"]["transition"], "improved")
+
+        self.assertIsNone(data["Sprint"]["delta"])
+        self.assertIsNone(data["Sprint"]["transition"])
+
+        self.assertEqual(data["Posture"]["old"]["score"], "good")
+        self.assertEqual(data["Posture"]["new"]["score"], "bad")
+        self.assertIsNone(data["Posture"]["delta"])
+        self.assertEqual(data["Posture"]["transition"], "regressed")
+
+        self.assertIsNone(data["Vertical"]["old"])
+        self.assertIsNone(data["Vertical"]["transition"])
+
+    def test_query_count_is_constant(self):
+        with self.assertNumQueries(2):
+            self.client.get(self.url())
+
+    def test_missing_report_returns_not_found(self):
+        response = self.client.get(self.url(new_date="2023-07-01"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_date_returns_bad_request(self):
+        response = self.client.get(self.url(old_date="January"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_athletes_only_compare_their_own_reports(self):
+        other = get_user_model().objects.create_user(email="other@example.com", password="kjhdfJHJHjhflnkjwh876!")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(self.url()).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.athlete)
+        self.assertEqual(self.client.get(self.url()).status_code, status.HTTP_200_OK)
+
+
+class ReportRecommendationsTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.client.force_authenticate(user=self.athlete)
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.earlier = Report.objects.create(user=self.athlete, template=self.template, creation_date=datetime.date(2023, 1, 1))
+        self.report = Report.objects.create(user=self.athlete, template=self.template, creation_date=datetime.date(2023, 6, 1))
+
+        self.jump = self.quantitative("Broad Jump", "100", "gte", [(self.earlier, "105"), (self.report, "90")])
+        self.sprint = self.quantitative("Sprint", "5", "lte", [(self.earlier, "7"), (self.report, "6")])
+        self.vertical = self.quantitative("Vertical", "30", "gte", [(self.report, "31")])
+        self.skipped = self.quantitative("Shuttle", "5", "lte", [(self.report, "0")], did_not_test=True)
+
+        self.posture = Assessment.objects.create(name="Posture", assessment_type="qualitative")
+        good = QualitativeAssessmentChoices.objects.create(assessment=self.posture, choice="good")
+        bad = QualitativeAssessmentChoices.objects.create(assessment=self.posture, choice="bad")
+        details = QualitativeAssessment.objects.create(assessment=self.posture, passing_score=good)
+        AssessmentScore.objects.create(
+            assessment=self.posture,
+            user=self.athlete,
+            report=self.report,
+            choice=bad
+        )
+        Drill.objects.create(name="Wall Drill", url="https://example.com/wall").assessments.add(self.posture)
+        self.url = reverse("user-report-recommendations", args=[self.template.pk, "2023-06-01"])
+
+    def quantitative(self, name, passing_score, passing_condition, scores, did_not_test=False):
+        assessment = Assessment.objects.create(name=name, assessment_type="quantitative")
+        details = QuantitativeAssessment.objects.create(
+            assessment=assessment,
+            passing_score=Decimal(passing_score),
+            passing_condition=passing_condition
+        )
+        for report, score in scores:
+            AssessmentScore.objects.create(
+                assessment=assessment,
+                user=self.athlete,
+                report=report,
+                value=Decimal(score),
+                did_not_test=did_not_test
+            )
+        Drill.objects.create(name=f"{name} Drill", url="https://example.com/drill").assessments.add(assessment)
+        return assessment
+
+    def test_recommends_drills_for_failed_assessments_by_priority(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([entry["name"] for entry in response.data], ["Posture", "Sprint", "Broad Jump"])
+
+        posture, sprint, jump = response.data
+        self.assertEqual(posture["priority"], 2.0)
+        self.assertEqual(posture["drills"], [{"name": "Wall Drill", "drill_url": "https://example.com/wall"}])
+        self.assertEqual(sprint["shortfall"], 0.2)
+        self.assertEqual((sprint["times_failed"], sprint["times_tested"]), (2, 2))
+        self.assertEqual(sprint["priority"], 1.2)
+        self.assertEqual(jump["shortfall"], 0.1)
+        self.assertEqual(jump["fail_rate"], 0.5)
+
+    def test_recommendations_are_cached_until_the_athlete_is_rescored(self):
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AssessmentScore.objects.filter(report=self.report, assessment=self.jump).update(value=Decimal("100"))
+            AssessmentScore.objects.get(report=self.report, assessment=self.jump).save()
+        response = self.client.get(self.url)
+        self.assertEqual([entry["name"] for entry in response.data], ["Posture", "Sprint"])
+
+    def test_trainer_can_read_athlete_recommendations(self):
+        trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=trainer)
+        url = reverse("trainer-user-report-recommendations", args=[self.athlete.pk, self.template.pk, "2023-06-01"])
+        response = self.client.get(url)
+        self.assertEqual(len(response.data), 3)
+
+    def test_athletes_can_not_read_other_athletes_recommendations(self):
+        other = get_user_model().objects.create_user(email="other@example.com", password="kjhdfJHJHjhflnkjwh876!")
+        self.client.force_authenticate(user=other)
+        url = reverse("trainer-user-report-recommendations", args=[self.athlete.pk, self.template.pk, "2023-06-01"])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_missing_report_returns_not_found(self):
+        response = self.client.get(reverse("user-report-recommendations", args=[self.template.pk, "2023-07-01"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AssessmentPercentileTest(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.assessment = Assessment.objects.create(name="Broad Jump", assessment_type="quantitative")
+        QuantitativeAssessment.objects.create(
+            assessment=self.assessment,
+            passing_score=Decimal("100"),
+            passing_condition="gte"
+        )
+        self.template.assessments.add(self.assessment)
+        self.url = reverse("assessment-percentile", args=[self.assessment.pk])
+
+    def submit(self, score):
+        data = {
+            "userId": self.user.pk,
+            "templateId": self.template.pk,
+            "date": "2023-11-01",
+            "didNotTest": [],
+            "assessments": {
+                "Broad Jump": {"id": self.assessment.pk, "type": "quantitative", "value": score},
+            },
+        }
+        self.client.post("/api/reports/build-report/", data, format="json")
+
+    def test_percentile_summary(self):
+        for score in ["90", "100", "110", "120"]:
+            self.submit(score)
+        response = self.client.get(self.url, {"score": "110", "bins": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(response.data["percentile"], 62.5)
+        self.assertEqual(response.data["median"], 105.0)
+        self.assertEqual(response.data["quartiles"], [97.5, 105.0, 112.5])
+        self.assertEqual(response.data["histogram"], {"edges": [90.0, 105.0, 120.0], "counts": [2, 2]})
+
+    def test_new_scores_update_distribution_incrementally(self):
+        self.submit("90")
+        self.client.get(self.url, {"score": "100"})
+        self.submit("110")
+
+        distribution = AssessmentScoreDistribution.objects.get(assessment=self.assessment)
+        self.assertFalse(distribution.stale)
+        self.assertEqual(distribution.values, [90.0, 110.0])
+        # A fresh distribution is read without locking it
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"score": "100"})
+        self.assertEqual(response.data["percentile"], 50)
+
+    def test_first_scores_create_a_stale_distribution(self):
+        self.submit("90")
+        self.assertTrue(AssessmentScoreDistribution.objects.get(assessment=self.assessment).stale)
+        self.assertEqual(self.client.get(self.url, {"score": "100"}).data["count"], 1)
+
+    def test_deleted_score_marks_distribution_stale(self):
+        self.submit("90")
+        self.client.get(self.url, {"score": "100"})
+        AssessmentScore.objects.get().delete()
+        self.assertTrue(AssessmentScoreDistribution.objects.get(assessment=self.assessment).stale)
+        self.assertEqual(self.client.get(self.url, {"score": "100"}).data["count"], 0)
+
+    def test_missing_score_returns_bad_request(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_finite_score_returns_bad_request(self):
+        for score in ("nan", "inf", "-inf"):
+            response = self.client.get(self.url, {"score": score})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_too_many_bins_returns_bad_request(self):
+        response = self.client.get(self.url, {"score": "100", "bins": 101})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "bins must be at most 100"})
+
+
+class TemplateAssessmentsTest(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.other_template = ReportTemplate.objects.create(name="Other")
+
+        orders = [3, None, 1, 2]
+        self.assessments = []
+        for i, order in enumerate(orders):
+            assessment = Assessment.objects.create(name=f"Qual {i}", assessment_type="qualitative")
+            QualitativeAssessmentChoices.objects.create(assessment=assessment, choice="good")
+            QualitativeAssessmentChoices.objects.create(assessment=assessment, choice="bad")
+            self.template.assessments.add(assessment)
+            self.other_template.assessments.add(assessment)
+            if order is not None:
+                TemplateAssessmentRelationship.objects.create(template=self.template, assessment=assessment, order=order)
+            # the order in another template must not leak in
+            TemplateAssessmentRelationship.objects.create(template=self.other_template, assessment=assessment, order=10 - i)
+            self.assessments.append(assessment)
+        self.url = reverse("reporttemplate-assessments", args=[self.template.pk])
+        cache.clear()
+
+    def test_assessments_are_ordered_with_choices(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["name"] for item in response.data], ["Qual 2", "Qual 3", "Qual 0", "Qual 1"])
+        self.assertEqual([choice["choice"] for choice in response.data[0]["qualitative_choices"]], ["good", "bad"])
+
+    def test_query_count_does_not_grow_with_assessments(self):
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+    def test_form_is_served_from_cache(self):
+        response = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.data, response.data)
+
+    def test_changes_invalidate_cached_form(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            QualitativeAssessmentChoices.objects.create(assessment=self.assessments[2], choice="ok")
+        response = self.client.get(self.url)
+        self.assertEqual([choice["choice"] for choice in response.data[0]["qualitative_choices"]], ["good", "bad", "ok"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            relationship = TemplateAssessmentRelationship.objects.get(template=self.template, assessment=self.assessments[0])
+            relationship.order = 0
+            relationship.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["name"], "Qual 0")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.template.assessments.remove(self.assessments[1])
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 3)
+
+
+
+class ConditionalReportGetTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.report = create_report(self.user, self.template, datetime.date(2023, 11, 1), 2)
+        self.url = reverse("user-report", args=[self.template.pk, "2023-11-01"])
+
+    def test_matching_etag_returns_not_modified_without_queries(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_score_change_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            score = AssessmentScore.objects.get(report=self.report, choice__isnull=True)
+            score.value = Decimal("50")
+            score.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_drill_change_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Drill.objects.create(name="New Drill").assessments.add(self.report.assessments.first())
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_new_report_changes_report_dates_etag(self):
+        url = reverse("report-template-report-dates-user", args=[self.template.pk, self.user.pk])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Report.objects.create(user=self.user, template=self.template, creation_date=datetime.date(2023, 12, 1))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_etag_is_per_user(self):
+        other = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        create_report(other, self.template, datetime.date(2023, 11, 1), 2)
+        etag = self.client.get(self.url)["ETag"]
+        self.client.force_authenticate(user=other)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ScoreExportTest(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.trainer)
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.other_template = ReportTemplate.objects.create(name="Other")
+        create_report(self.athlete, self.template, datetime.date(2023, 11, 1), 2)
+        create_report(self.athlete, self.template, datetime.date(2023, 12, 1), 2)
+        create_report(self.athlete, self.other_template, datetime.date(2023, 11, 1), 2)
+        self.url = reverse("export-scores")
+
+    def test_csv_export(self):
+        response = self.client.get(self.url, {"template": self.template.pk, "start": "2023-11-15"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["report_id", "creation_date", "template"])
+        self.assertEqual(len(lines), 3)
+        self.assertIn("2023-12-01,Combine", lines[1])
+        self.assertIn("Quant 0,quantitative,inches,0.00,False,False", lines[1])
+        self.assertIn("Qual 1,qualitative,,bad,False,False", lines[2])
+
+    def test_ndjson_export(self):
+        response = self.client.get(self.url, {"export_format": "ndjson"})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]["email"], "athlete@example.com")
+        self.assertEqual(rows[0]["score"], "0.00")
+
+    def test_non_staff_is_forbidden(self):
+        self.client.force_authenticate(user=self.athlete)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_format_returns_bad_request(self):
+        response = self.client.get(self.url, {"export_format": "xlsx"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReportListTest(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.trainer)
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.other = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="kjhdfJHJHjhflnkjwh876!"
+        )
+        self.template = ReportTemplate.objects.create(name="Combine")
+        self.other_template = ReportTemplate.objects.create(name="Other")
+        self.scored = create_report(self.athlete, self.template, datetime.date(2023, 1, 1), 4)
+        for day in range(2, 7):
+            Report.objects.create(user=self.athlete, template=self.template, creation_date=datetime.date(2023, 1, day))
+        Report.objects.create(user=self.other, template=self.other_template, creation_date=datetime.date(2023, 2, 1))
+        self.url = reverse("report-list")
+
+    def test_lists_newest_first_across_cursor_pages(self):
+        response = self.client.get(self.url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        dates = [report["creation_date"] for report in response.data["results"]]
+        self.assertEqual(dates, ["2023-02-01", "2023-01-06", "2023-01-05"])
+
+        seen = dates
+        next_url = response.data["next"]
+        while next_url:
+            response = self.client.get(next_url)
+            seen += [report["creation_date"] for report in response.data["results"]]
+            next_url = response.data["next"]
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(seen[-1], "2023-01-01")
+
+    def test_filters_by_athlete_template_and_date_range(self):
+        response = self.client.get(self.url, {
+            "athlete": self.athlete.pk,
+            "template": self.template.pk,
+            "start": "2023-01-02",
+            "end": "2023-01-04",
+        })
+        self.assertEqual([report["creation_date"] for report in response.data["results"]], ["2023-01-04", "2023-01-03", "2023-01-02"])
+        self.assertEqual(response.data["results"][0]["email"], "athlete@example.com")
+        self.assertEqual(response.data["results"][0]["template_name"], "Combine")
+
+    def test_invalid_filter_returns_bad_request(self):
+        response = self.client.get(self.url, {"start": "January"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pass_rate_is_annotated_on_request(self):
+        # create_report scores Quant 0 and Quant 2 below the passing score and only Qual 3 good
+        response = self.client.get(self.url, {"end": "2023-01-01"})
+        self.assertIsNone(response.data["results"][0]["pass_rate"])
+
+        response = self.client.get(self.url, {"end": "2023-01-01", "pass_rate": "true"})
+        self.assertEqual(response.data["results"][0]["pass_rate"], 0.25)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {"page_size": 2, "pass_rate": "true"})
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {"page_size": 7, "pass_rate": "true"})
+
+    def test_athletes_can_not_list_reports(self):
+        self.client.force_authenticate(user=self.athlete)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TrainerDashboardTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.trainer = get_user_model().objects.create_user(
+            email="trainer@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            is_staff=True
+        )
+        self.client.force_authenticate(user=self.trainer)
+        self.athlete = get_user_model().objects.create_user(
+            email="athlete@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            last_name="Adams"
+        )
+        self.other = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="kjhdfJHJHjhflnkjwh876!",
+            last_name="Baker"
+        )
+        self.combine = ReportTemplate.objects.create(name="Combine")
+        self.speed = ReportTemplate.objects.create(name="Speed")
+        create_report(self.athlete, self.combine, datetime.date(2023, 1, 1), 2)
+        self.latest = create_report(self.athlete, self.combine, datetime.date(2023, 6, 1), 4)
+        AssessmentScore.objects.filter(report=self.latest, value__isnull=False).update(did_not_test=True)
+        AssessmentScore.objects.filter(report=self.latest, value__isnull=False).first().delete()
+        self.speed_report = Report.objects.create(user=self.athlete, template=self.speed, creation_date=datetime.date(2023, 3, 1))
+        self.url = reverse("trainer-dashboard")
+
+    @override_settings(TRAINER_DASHBOARD_CACHE_TIMEOUT=0)
+    def test_lists_latest_report_per_template_for_every_athlete(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([athlete["email"] for athlete in response.data], ["athlete@example.com", "other@example.com"])
+
+        athlete, other = response.data
+        self.assertEqual(other["reports"], [])
+        self.assertEqual(athlete["reports"], [
+            {
+                "report": self.latest.pk,
+                "template": self.combine.pk,
+                "template_name": "Combine",
+                "creation_date": datetime.date(2023, 6, 1),
+                "passed": 1,
+                "failed": 1,
+                "did_not_test": 1,
+            },
+            {
+                "report": self.speed_report.pk,
+                "template": self.speed.pk,
+                "template_name": "Speed",
+                "creation_date": datetime.date(2023, 3, 1),
+                "passed": 0,
+                "failed": 0,
+                "did_not_test": 0,
+            },
+        ])
+
+    @override_settings(TRAINER_DASHBOARD_CACHE_TIMEOUT=0)
+    def test_query_count_does_not_grow_with_athletes(self):
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        create_report(self.other, self.speed, datetime.date(2023, 3, 1), 4)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+    @override_settings(TRAINER_DASHBOARD_CACHE_TIMEOUT=30)
+    def test_dashboard_is_cached_for_a_short_time(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_athletes_can_not_read_the_dashboard(self):
+        self.client.force_authenticate(user=self.athlete)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
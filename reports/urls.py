@@ -4,8 +4,17 @@ from .views import (
     ReportTemplateViewSet, 
     ReportTemplateListVeiwset,
     HandleReportForm,
+    HandleTeamReportForm,
+    ReportList,
+    TrainerDashboard,
+    ReportComparison,
     UserReport,
     UserReportTrainer,
+    UserReportRecommendations,
+    UserReportRecommendationsTrainer,
+    UserAssessmentTrend,
+    AssessmentPercentile,
+    ScoreExport,
 )
 
 router = DefaultRouter()
@@ -15,8 +24,17 @@ router.register(r'report-templates-min', ReportTemplateListVeiwset)
 urlpatterns = [
     path('', include(router.urls)),
     path("build-report/", HandleReportForm.as_view()),
+    path("build-team-report/", HandleTeamReportForm.as_view(), name="build-team-report"),
     path("report-templates/<int:pk>/report-dates/", ReportTemplateViewSet.as_view({'get': 'report_dates'}), name='report-template-report-dates'),
     path("report-templates/<int:pk>/<int:user_pk>/report-dates/", ReportTemplateViewSet.as_view({'get': 'report_dates_user'}), name='report-template-report-dates-user'),
+    path("report-list/", ReportList.as_view(), name="report-list"),
+    path("trainer-dashboard/", TrainerDashboard.as_view(), name="trainer-dashboard"),
     path("user-report/<int:template_pk>/<str:date>/", UserReport.as_view(), name="user-report"),
     path("trainer-user-report/<int:user_pk>/<int:template_pk>/<str:date>/", UserReportTrainer.as_view(), name="trainer-user-report"),
+    path("user-report/<int:template_pk>/<str:date>/recommendations/", UserReportRecommendations.as_view(), name="user-report-recommendations"),
+    path("trainer-user-report/<int:user_pk>/<int:template_pk>/<str:date>/recommendations/", UserReportRecommendationsTrainer.as_view(), name="trainer-user-report-recommendations"),
+    path("report-diff/<int:user_pk>/<int:template_pk>/<str:old_date>/<str:new_date>/", ReportComparison.as_view(), name="report-diff"),
+    path("assessment-percentile/<int:assessment_pk>/", AssessmentPercentile.as_view(), name="assessment-percentile"),
+    path("export-scores/", ScoreExport.as_view(), name="export-scores"),
+    path("user-trend/<int:user_pk>/<int:template_pk>/", UserAssessmentTrend.as_view(), name="user-trend"),
 ]
@@ -1,26 +1,63 @@
 import datetime
-from decimal import Decimal, InvalidOperation
+import math
+from decimal import InvalidOperation
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from rest_framework import viewsets, permissions, status, views
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics, viewsets, permissions, status, views
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import (
     Assessment,
+    AssessmentScoreDistribution,
     Report,
     ReportTemplate,
-    QualitativeAssessmentChoices,
-    QualitativeAssessmentScore,
-    QuantitativeAssessmentScore,
-    TemplateAssessmentRelationship
+    QualitativeAssessmentChoices
 )
-from .permissions import CustomPermission
+from .analytics import assessment_trends, compare_reports, trainer_dashboard
+from .cache import (
+    get_report_recommendations,
+    get_template_form,
+    get_trainer_dashboard,
+    invalidate_user_reports,
+    user_reports_etag,
+)
+from .exports import EXPORT_FORMATS, export_lines, score_rows
+from .filters import ReportFilter
+from .pagination import ReportCursorPagination
+from .permissions import CustomPermission, OwnDataPermission
+from .recommendations import get_recommendations
 from .serializers import (
     AssessmentSerializer,
     AssessmentWithChoicesSerializer,
+    ReportListSerializer,
     ReportTemplateSerializer, 
     ReportTemplateListSerializer
 )
+from .services import (
+    annotate_pass_counts,
+    build_scores,
+    get_report_data,
+    refresh_snapshot,
+    resolve_assessments,
+    save_scores,
+    template_assessments
+)
+
+
+# Bins are built in the request, so their number is capped
+MAX_HISTOGRAM_BINS = 100
+
+
+def own_reports_etag(request, *args, **kwargs):
+    return user_reports_etag(request.user.pk)
+
+
+def athlete_reports_etag(request, *args, user_pk=None, **kwargs):
+    return user_reports_etag(user_pk)
 
 
 class ReportTemplateViewSet(viewsets.ModelViewSet):
@@ -30,26 +67,15 @@ class ReportTemplateViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["GET"])
     def assessments(self, request, pk=None):
-        template = self.get_object()
-        assessments = template.assessments.all()
-        # assessment_order = {}
-        # for assessment in assessments:
-        #     try:
-        #         order = TemplateAssessmentRelationship.objects.get(
-        #             template=template,
-        #             assessment=assessment
-        #         ).order
-        #         assessment_order[assessment.id] = order
-        #     except TemplateAssessmentRelationship.DoesNotExist:
-        #         assessment_order[assessment.id] = float("inf")
-
-        # sorted_assessments = sorted(
-        #     assessments,
-        #     key=lambda assessment: assessment_order.get(assessment.id, float("inf")))
-        serializer = AssessmentWithChoicesSerializer(assessments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def build():
+            template = self.get_object()
+            serializer = AssessmentWithChoicesSerializer(template_assessments(template), many=True)
+            return list(serializer.data)
+
+        return Response(get_template_form(pk, build), status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["GET"])
+    @method_decorator(condition(etag_func=own_reports_etag))
     def report_dates(self, request, pk=None):
         template = self.get_object()
         user = request.user
@@ -57,6 +83,7 @@ class ReportTemplateViewSet(viewsets.ModelViewSet):
         return Response(report_dates, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["GET"])
+    @method_decorator(condition(etag_func=athlete_reports_etag))
     def report_dates_user(self, request, pk=None, user_pk=None):
         template = self.get_object()
         user = get_user_model().objects.get(pk=user_pk)
@@ -70,6 +97,31 @@ class ReportTemplateListVeiwset(viewsets.ReadOnlyModelViewSet):
     permission_classes = [CustomPermission, permissions.IsAuthenticated]
 
 
+class ReportList(generics.ListAPIView):
+    """
+    Reports of every athlete, newest first, filterable by athlete, template
+    and date range. pass_rate=true adds the share of tested assessments passed.
+    """
+    serializer_class = ReportListSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = ReportCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ReportFilter
+
+    def get_queryset(self):
+        reports = Report.objects.select_related("user", "template").defer("snapshot")
+        if self.request.query_params.get("pass_rate", "").lower() in ("1", "true"):
+            reports = annotate_pass_counts(reports)
+        return reports
+
+
+class TrainerDashboard(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_trainer_dashboard(trainer_dashboard), status=status.HTTP_200_OK)
+
+
 class HandleReportForm(views.APIView):
     permission_classes = [CustomPermission, permissions.IsAuthenticated]
 
@@ -106,38 +158,16 @@ class HandleReportForm(views.APIView):
             return Response({"error": "assessments not provided"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            with transaction.atomic():
-                report = Report.objects.create(user=user, template=template, creation_date=date_obj)
-
-                for assessment, assessment_data in assessments.items():
-                    assessment_obj = Assessment.objects.get(pk=assessment_data["id"])
-                    report.assessments.add(assessment_obj)
-                    
-                    did_not_test = True if assessment_data["id"] in did_not_test_ids else False
-
-                    if assessment_data["type"] == "qualitative":
-                        choice = assessment_data["value"]
-                        choice_obj = assessment_obj.choices.get(choice=choice)
-                        QualitativeAssessmentScore.objects.create(
-                            assessment=assessment_obj,
-                            qualitative_assessment=assessment_obj.qualitative_details,
-                            user=user,
-                            report=report,
-                            score=choice_obj,
-                            did_not_test=did_not_test
-                        )
-                    elif assessment_data["type"] == "quantitative":
-                        score = Decimal(assessment_data["value"])
-                        QuantitativeAssessmentScore.objects.create(
-                            assessment=assessment_obj,
-                            quantitative_assessment=assessment_obj.quantitative_details,
-                            user=user,
-                            report=report,
-                            score=score,
-                            did_not_test=did_not_test
-                        )
-                    else:
-                        raise ValueError("Assessment type")
+            report = Report(user=user, template=template, creation_date=date_obj)
+            assessment_map = resolve_assessments(
+                assessment_data["id"] for assessment_data in assessments.values()
+            )
+            scores = build_scores(
+                report,
+                assessments,
+                did_not_test_ids,
+                assessment_map
+            )
         except Assessment.DoesNotExist:
             return Response({"error": "Assessment does not exists"}, status=status.HTTP_400_BAD_REQUEST)
         except QualitativeAssessmentChoices.DoesNotExist:
@@ -146,145 +176,265 @@ class HandleReportForm(views.APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except InvalidOperation as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        
+
+        with transaction.atomic():
+            report.save()
+            save_scores(scores)
+            refresh_snapshot(report)
+            # Last, the distribution rows stay locked until the commit
+            AssessmentScoreDistribution.record(scores)
+
         return Response({"Report created"}, status=status.HTTP_200_OK)
 
 
+class HandleTeamReportForm(views.APIView):
+    """
+    Create the reports of many athletes tested against one template on one date.
+
+    The template's assessments are loaded once and every athlete is
+    validated against them. Athletes with invalid results get an error in
+    the response, the reports of the others are inserted together. Their
+    snapshots are built on first read.
+    """
+    permission_classes = [CustomPermission, permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        data = request.data
+
+        try:
+            template_id = data["templateId"]
+            template = ReportTemplate.objects.get(pk=template_id)
+        except KeyError:
+            return Response({"error": "templateId not provided"}, status=status.HTTP_400_BAD_REQUEST)
+        except ReportTemplate.DoesNotExist:
+            return Response({"error": "Report Template does not exists"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            date_str = data["date"]
+            date_obj = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+        except KeyError:
+            return Response({"error": "Date not provided"}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({"error": "Invalid date format. Excpected YYYY-MM_DD."}, status=status.HTTP_400_BAD_REQUEST)
+
+        athletes = data.get("athletes")
+        if not isinstance(athletes, list):
+            return Response({"error": "athletes not provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        assessment_map = resolve_assessments(template.assessments.values_list("pk", flat=True))
+        users = get_user_model().objects.in_bulk([
+            athlete["userId"] for athlete in athletes
+            if isinstance(athlete, dict) and isinstance(athlete.get("userId"), int)
+        ])
+
+        results = []
+        reports = []
+        scores = []
+        for athlete in athletes:
+            user_id = athlete.get("userId") if isinstance(athlete, dict) else None
+            report = Report(user=users.get(user_id), template=template, creation_date=date_obj)
+            try:
+                athlete_scores = self.build_athlete_scores(report, athlete, assessment_map)
+            except (ValueError, InvalidOperation) as e:
+                results.append({"userId": user_id, "error": str(e)})
+                continue
+            reports.append(report)
+            scores.extend(athlete_scores)
+            results.append({"userId": user_id, "created": True})
+
+        with transaction.atomic():
+            Report.objects.bulk_create(reports)
+            save_scores(scores)
+            # bulk_create sends no post_save and save_scores only covers athletes with scores
+            for user_id in {report.user_id for report in reports} - {score.user_id for score in scores}:
+                invalidate_user_reports(user_id)
+            # Last, the distribution rows stay locked until the commit
+            AssessmentScoreDistribution.record(scores)
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    def build_athlete_scores(self, report, athlete, assessment_map):
+        """Validate the results of one athlete, raising ValueError with the error message."""
+        if not isinstance(athlete, dict) or "userId" not in athlete:
+            raise ValueError("userId not provided")
+        if report.user_id is None:
+            raise ValueError("User does not exists")
+        if "assessments" not in athlete:
+            raise ValueError("assessments not provided")
+
+        try:
+            scores = build_scores(
+                report,
+                athlete["assessments"],
+                set(athlete.get("didNotTest", [])),
+                assessment_map
+            )
+        except Assessment.DoesNotExist:
+            raise ValueError("Assessment does not exists")
+        except QualitativeAssessmentChoices.DoesNotExist:
+            raise ValueError("Choice does not exists")
+        except (KeyError, TypeError, AttributeError):
+            raise ValueError("Invalid assessment data")
+
+        return scores
+
+
 class UserReport(views.APIView):
     permission_classes = [CustomPermission, permissions.IsAuthenticated]
 
+    @method_decorator(condition(etag_func=own_reports_etag))
     def get(self, request, template_pk=None, date=None):
-        user = request.user
-        template = ReportTemplate.objects.get(pk=template_pk)
-        creation_date = date
-
-        report = Report.objects.filter(
-            user=user,
-            template=template,
-            creation_date=creation_date
-        ).first()
-
-        assessments = report.assessments.all()
-
-        data = []
-
-        for assessment in assessments:
-            name = assessment.name
-            type = assessment.assessment_type
-            description = assessment.description
-            unit = assessment.unit
-            
-            if type == "quantitative":
-                passing_score = assessment.quantitative_details.passing_score
-                quantitative_obj = QuantitativeAssessmentScore.objects.get(
-                    user=user,
-                    assessment=assessment,
-                    quantitative_assessment=assessment.quantitative_details,
-                    report=report
-                )
-                score = quantitative_obj.score
-                passed = quantitative_obj.passed()
-                did_not_test = quantitative_obj.did_not_test
-            else:
-                passing_score = assessment.qualitative_details.passing_score.choice
-                qualitative_obj = QualitativeAssessmentScore.objects.get(
-                    assessment=assessment,
-                    qualitative_assessment=assessment.qualitative_details,
-                    user=user,
-                    report=report
-                )
-                score = qualitative_obj.score.choice
-                passed = qualitative_obj.passed()
-                did_not_test = qualitative_obj.did_not_test
-            drills = []
-            drill_objs = assessment.drills.all()
-            for drill in drill_objs:
-                drill_name = drill.name
-                drill_url = drill.url
-                drills.append({"name": drill_name, "drill_url": drill_url})
-
-            assessment_data = {
-                "name": name,
-                "type": type,
-                "description": description,
-                "unit": unit,
-                "passing_score": passing_score,
-                "score": score,
-                "passed": passed,
-                "did_not_test": did_not_test,
-                "drills": drills
-            }
-
-            data.append(assessment_data)
+        data = get_report_data(request.user.pk, template_pk, date)
+        if data is None:
+            return Response({"error": "Report does not exist"}, status=status.HTTP_404_NOT_FOUND)
         return Response(data, status=status.HTTP_200_OK)
 
 
 class UserReportTrainer(views.APIView):
     permission_classes = [CustomPermission, permissions.IsAuthenticated]
 
+    @method_decorator(condition(etag_func=athlete_reports_etag))
     def get(self, request, template_pk=None, date=None, user_pk=None):
-        user = get_user_model().objects.get(pk=user_pk)
-        template = ReportTemplate.objects.get(pk=template_pk)
-        creation_date = date
-
-        report = Report.objects.filter(
-            user=user,
-            template=template,
-            creation_date=creation_date
-        ).first()
-
-        print(report)
-
-        assessments = report.assessments.all()
-
-        data = []
-
-        for assessment in assessments:
-            name = assessment.name
-            type = assessment.assessment_type
-            description = assessment.description
-            unit = assessment.unit
-            
-            if type == "quantitative":
-                passing_score = assessment.quantitative_details.passing_score
-                quantitative_obj = QuantitativeAssessmentScore.objects.get(
-                    user=user,
-                    assessment=assessment,
-                    quantitative_assessment=assessment.quantitative_details,
-                    report=report
-                )
-                score = quantitative_obj.score
-                passed = quantitative_obj.passed()
-                did_not_test = quantitative_obj.did_not_test
-            else:
-                passing_score = assessment.qualitative_details.passing_score.choice
-                qualitative_obj = QualitativeAssessmentScore.objects.get(
-                    assessment=assessment,
-                    qualitative_assessment=assessment.qualitative_details,
-                    user=user,
-                    report=report
-                )
-                score = qualitative_obj.score.choice
-                passed = qualitative_obj.passed()
-                did_not_test = qualitative_obj.did_not_test
-            drills = []
-            drill_objs = assessment.drills.all()
-            for drill in drill_objs:
-                drill_name = drill.name
-                drill_url = drill.url
-                drills.append({"name": drill_name, "drill_url": drill_url})
-
-            assessment_data = {
-                "name": name,
-                "type": type,
-                "description": description,
-                "unit": unit,
-                "passing_score": passing_score,
-                "score": score,
-                "passed": passed,
-                "did_not_test": did_not_test,
-                "drills": drills
-            }
-
-            data.append(assessment_data)
-        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
+        data = get_report_data(user_pk, template_pk, date)
+        if data is None:
+            return Response({"error": "Report does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+def recommendations_response(user_pk, template_pk, date):
+    try:
+        date_obj = datetime.datetime.strptime(date, '%Y-%m-%d').date()
+    except ValueError:
+        return Response({"error": "Invalid date format. Excpected YYYY-MM_DD."}, status=status.HTTP_400_BAD_REQUEST)
+
+    data = get_report_recommendations(
+        user_pk,
+        template_pk,
+        date_obj,
+        lambda: get_recommendations(user_pk, template_pk, date_obj)
+    )
+    if data is None:
+        return Response({"error": "Report does not exist"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+class UserReportRecommendations(views.APIView):
+    permission_classes = [CustomPermission, permissions.IsAuthenticated]
+
+    @method_decorator(condition(etag_func=own_reports_etag))
+    def get(self, request, template_pk=None, date=None):
+        return recommendations_response(request.user.pk, template_pk, date)
+
+
+class UserReportRecommendationsTrainer(views.APIView):
+    permission_classes = [CustomPermission, permissions.IsAuthenticated, OwnDataPermission]
+
+    @method_decorator(condition(etag_func=athlete_reports_etag))
+    def get(self, request, template_pk=None, date=None, user_pk=None):
+        return recommendations_response(user_pk, template_pk, date)
+
+
+class UserAssessmentTrend(views.APIView):
+    permission_classes = [CustomPermission, permissions.IsAuthenticated, OwnDataPermission]
+
+    def get(self, request, template_pk=None, user_pk=None):
+        try:
+            window = int(request.query_params.get("window", 3))
+        except ValueError:
+            return Response({"error": "window must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if window < 1:
+            return Response({"error": "window must be at least 1"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(assessment_trends(user_pk, template_pk, window), status=status.HTTP_200_OK)
+
+
+class ReportComparison(views.APIView):
+    permission_classes = [CustomPermission, permissions.IsAuthenticated, OwnDataPermission]
+
+    @method_decorator(condition(etag_func=athlete_reports_etag))
+    def get(self, request, user_pk=None, template_pk=None, old_date=None, new_date=None):
+        try:
+            old_date = datetime.datetime.strptime(old_date, '%Y-%m-%d').date()
+            new_date = datetime.datetime.strptime(new_date, '%Y-%m-%d').date()
+        except ValueError:
+            return Response({"error": "Invalid date format. Excpected YYYY-MM_DD."}, status=status.HTTP_400_BAD_REQUEST)
+
+        comparison = compare_reports(user_pk, template_pk, old_date, new_date)
+        if comparison is None:
+            return Response({"error": "Report does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(comparison, status=status.HTTP_200_OK)
+
+
+class AssessmentPercentile(views.APIView):
+    permission_classes = [CustomPermission, permissions.IsAuthenticated]
+
+    def get(self, request, assessment_pk=None):
+        try:
+            assessment = Assessment.objects.get(pk=assessment_pk, assessment_type="quantitative")
+        except Assessment.DoesNotExist:
+            return Response({"error": "Quantitative assessment does not exist"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            score = float(request.query_params["score"])
+        except KeyError:
+            return Response({"error": "score not provided"}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({"error": "score must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        # float() accepts nan and inf, which can not be rendered as JSON
+        if not math.isfinite(score):
+            return Response({"error": "score must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            bins = int(request.query_params.get("bins", 10))
+        except ValueError:
+            return Response({"error": "bins must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if bins < 1:
+            return Response({"error": "bins must be at least 1"}, status=status.HTTP_400_BAD_REQUEST)
+        if bins > MAX_HISTOGRAM_BINS:
+            return Response({"error": f"bins must be at most {MAX_HISTOGRAM_BINS}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        distribution = AssessmentScoreDistribution.get_fresh([(assessment.pk,)])[0]
+        data = {
+            "assessment": assessment.pk,
+            "score": score,
+            "count": distribution.count,
+            "percentile": distribution.percentile(score),
+            "median": distribution.quantile(0.5),
+            "quartiles": [distribution.quantile(q) for q in (0.25, 0.5, 0.75)],
+            "histogram": distribution.histogram(bins),
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ScoreExport(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        params = request.query_params
+
+        # "format" is taken by DRF's format suffixes
+        export_format = params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return Response({"error": f"export_format must be one of {', '.join(EXPORT_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {}
+        try:
+            for param in ("template", "user"):
+                if param in params:
+                    filters[f"{param}_id"] = int(params[param])
+        except ValueError:
+            return Response({"error": "template and user must be ids"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            for param in ("start", "end"):
+                if param in params:
+                    filters[param] = datetime.datetime.strptime(params[param], '%Y-%m-%d').date()
+        except ValueError:
+            return Response({"error": "Invalid date format. Excpected YYYY-MM_DD."}, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+        response = StreamingHttpResponse(
+            export_lines(export_format, score_rows(**filters)),
+            content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="scores.{export_format}"'
+        return response